@@ -0,0 +1,48 @@
+import time
+from collections import deque
+from typing import Deque, Iterable, Iterator, TypeVar
+
+Frame = TypeVar("Frame")
+
+class AdaptiveFrames:
+    """Paces a lazy stream of frames to what the viewer can keep up with.
+
+    Iterating yields frames from source, and the time until the next frame
+    is asked for is taken as the cost of showing one (pushing a Plotly
+    figure through a placeholder to the browser). While showing a frame
+    takes longer than target_interval, more source frames are skipped
+    (the stride doubles, up to max_stride); when it gets cheap again the
+    stride halves. Fast viewers are slowed down to target_interval so the
+    animation plays at a steady rate. The last `window` frames shown are
+    kept for replay, so memory stays bounded however long the run is.
+    """
+
+    def __init__(self, source: Iterable[Frame], target_interval: float = 0.1,
+                 max_stride: int = 16, window: int = 40):
+        self.source = source
+        self.target_interval = target_interval
+        self.max_stride = max_stride
+        self.stride = 1
+        self.recent: Deque[Frame] = deque(maxlen=window)
+        self.shown = 0
+        self.skipped = 0
+
+    def __iter__(self) -> Iterator[Frame]:
+        countdown = 0
+        for frame in self.source:
+            if countdown > 0:
+                countdown -= 1
+                self.skipped += 1
+                continue
+            self.recent.append(frame)
+            self.shown += 1
+            started = time.perf_counter()
+            yield frame
+            spent = time.perf_counter() - started
+            if spent > self.target_interval and self.stride < self.max_stride:
+                self.stride *= 2
+            elif spent < self.target_interval / 2 and self.stride > 1:
+                self.stride //= 2
+            if spent < self.target_interval:
+                time.sleep(self.target_interval - spent)
+            countdown = self.stride - 1
@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+class AnswerBank:
+    """Precomputed answers to the quick-question buttons, kept in a versioned JSON file.
+
+    The file records a format version and a prompt version (a fingerprint of
+    the model and system prompt); answers written under a different version
+    are ignored so a prompt change never serves outdated replies. Lookups are
+    plain dict reads from memory.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str, prompt_version: str, max_age_seconds: float = 24 * 60 * 60):
+        self.path = path
+        self.prompt_version = prompt_version
+        self.max_age_seconds = max_age_seconds
+        self._answers: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") != self.FORMAT_VERSION or data.get("prompt_version") != self.prompt_version:
+            return
+        with self._lock:
+            self._answers = data.get("answers", {})
+
+    def save(self):
+        with self._lock:
+            data = {
+                "version": self.FORMAT_VERSION,
+                "prompt_version": self.prompt_version,
+                "answers": dict(self._answers),
+            }
+        # Write to a temp file and swap it in so readers never see a partial file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".answer_bank_", suffix=".json")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, question: str) -> Optional[str]:
+        """Fresh answer for the question, or None if missing or stale"""
+        with self._lock:
+            entry = self._answers.get(question)
+        if entry is None or self._is_stale(entry):
+            return None
+        return entry["answer"]
+
+    def set(self, question: str, answer: str, persist: bool = True):
+        with self._lock:
+            self._answers[question] = {"answer": answer, "updated_at": time.time()}
+        if persist:
+            self.save()
+
+    def warm(self, questions: Iterable[str], answer_fn: Callable[[str], str]) -> int:
+        """Fill missing or stale answers; returns how many were refreshed"""
+        refreshed = 0
+        for question in questions:
+            if self.get(question) is not None:
+                continue
+            try:
+                answer = answer_fn(question)
+            except Exception:
+                # Leave the entry missing; the next refresh or a live click will retry
+                continue
+            if answer:
+                self.set(question, answer, persist=False)
+                refreshed += 1
+        if refreshed:
+            self.save()
+        return refreshed
+
+    def start_refresher(self, questions: Iterable[str], answer_fn: Callable[[str], str],
+                        interval_seconds: float = 60 * 60):
+        """Warm the bank now in a background thread, then re-check on a schedule"""
+        if self._refresher is not None:
+            return
+        questions = list(questions)
+
+        def run():
+            while True:
+                self.warm(questions, answer_fn)
+                if self._stop.wait(interval_seconds):
+                    return
+
+        self._refresher = threading.Thread(target=run, name="answer-bank-refresher", daemon=True)
+        self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _is_stale(self, entry: Dict) -> bool:
+        return time.time() - entry.get("updated_at", 0) > self.max_age_seconds
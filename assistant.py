@@ -0,0 +1,181 @@
+import hashlib
+import os
+from typing import Iterator
+
+import streamlit as st
+from answer_bank import AnswerBank
+from llm_backends import MODEL, create_backend
+from response_cache import ResponseCache, normalize_prompt
+from single_flight import LeaderAbandoned, SingleFlight
+
+# Child-friendly system prompt shared by the home page and chatbot
+SYSTEM_PROMPT = """You are a friendly and helpful educational assistant for children.
+Your responses should be:
+- Simple and easy to understand
+- Positive and encouraging
+- Brief (2-3 sentences)
+- Include emojis where appropriate
+- Educational but fun
+Focus on teaching about disasters, sustainability, and environmental topics."""
+
+END_TAG = "</assistant>"
+EMPTY_RESPONSE = "I'd be happy to help you learn about that! Could you try asking again? 🎓"
+ERROR_RESPONSE = "I'm excited to help! Could you please rephrase your question? 🌈"
+
+# Quick-question buttons: button label -> question sent to the assistant
+HOME_QUICK_QUESTIONS = {
+    "What is sustainability? 🌱": "What is sustainability?",
+    "How to save water? 💧": "How can I save water?",
+    "Earthquake safety? 🏠": "What should I do during an earthquake?",
+    "Recycling tips? ♻️": "How do I recycle properly?"
+}
+
+CHAT_QUICK_QUESTIONS = {
+    "What is sustainability? 🌱": "What is sustainability and why is it important?",
+    "How to save water? 💧": "What are some simple ways to save water at home?",
+    "Earthquake safety? 🏠": "What should I do during an earthquake?",
+    "Recycling tips? ♻️": "What are the basic rules of recycling?",
+    "Climate change? 🌍": "Can you explain climate change in simple terms?"
+}
+
+ANSWER_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'answer_bank.json')
+
+def build_prompt(prompt: str) -> str:
+    """Wrap the user prompt in the chat template the model expects"""
+    return f"""<system>{SYSTEM_PROMPT}</system>
+<user>{prompt}</user>
+<assistant>"""
+
+@st.cache_resource
+def get_response_cache() -> ResponseCache:
+    """One response cache shared by every session in this server process"""
+    return ResponseCache(max_entries=512, ttl_seconds=6 * 60 * 60)
+
+@st.cache_resource
+def get_llm_backend():
+    """Completion backend picked by the LLM_BACKEND env var (together, together-sdk or fake)"""
+    return create_backend(os.getenv("LLM_BACKEND", "together"))
+
+@st.cache_resource
+def get_single_flight() -> SingleFlight:
+    """Coalesces identical prompts that are in flight at the same time across sessions"""
+    return SingleFlight()
+
+@st.cache_resource
+def get_answer_bank() -> AnswerBank:
+    """Load the quick-question answer bank and start its background warm-up/refresh job"""
+    prompt_version = hashlib.sha256(f"{MODEL}\n{SYSTEM_PROMPT}".encode()).hexdigest()[:12]
+    bank = AnswerBank(ANSWER_BANK_PATH, prompt_version)
+    backend = get_llm_backend()
+    questions = dict.fromkeys([*HOME_QUICK_QUESTIONS.values(), *CHAT_QUICK_QUESTIONS.values()])
+    bank.start_refresher(questions, lambda question: generate_response(backend, question))
+    return bank
+
+def generate_response(backend, prompt: str) -> str:
+    """One uncached completion, cleaned up; errors propagate to the caller"""
+    # Same rule as the streaming path: nothing after the closing tag is kept
+    return backend.complete(build_prompt(prompt)).split(END_TAG, 1)[0].strip()
+
+def answer_quick_question(question: str) -> str:
+    """Serve a quick-question click from the answer bank, falling back to a live call"""
+    bank = get_answer_bank()
+    answer = bank.get(question)
+    if answer is not None:
+        return answer
+    answer = get_bot_response(question)
+    if answer not in (EMPTY_RESPONSE, ERROR_RESPONSE):
+        bank.set(question, answer)
+    return answer
+
+def get_bot_response(prompt: str) -> str:
+    cache = get_response_cache()
+    cached = cache.get(prompt)
+    if cached is not None:
+        return cached
+
+    def fetch() -> str:
+        response_text = generate_response(get_llm_backend(), prompt)
+        if response_text:
+            cache.put(prompt, response_text)
+        return response_text
+
+    try:
+        # Identical prompts already in flight share that call's result
+        response_text = get_single_flight().do(normalize_prompt(prompt), fetch)
+        return response_text or EMPTY_RESPONSE
+
+    except Exception as e:
+        st.error(f"API Error: {str(e)}")
+        return ERROR_RESPONSE
+
+def stream_bot_response(prompt: str) -> Iterator[str]:
+    """Yield the answer as it is generated, for use with st.write_stream"""
+    cache = get_response_cache()
+    cached = cache.get(prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    key = normalize_prompt(prompt)
+    flights = get_single_flight()
+    flight, leader = flights.acquire(key)
+    if not leader:
+        # Another session is already generating this answer; wait and show it whole
+        try:
+            response_text = flight.result()
+        except LeaderAbandoned:
+            # The leader's session went away mid-answer; run it ourselves
+            yield get_bot_response(prompt)
+            return
+        except Exception as e:
+            st.error(f"API Error: {str(e)}")
+            yield ERROR_RESPONSE
+            return
+        yield response_text or EMPTY_RESPONSE
+        return
+
+    parts = []
+    try:
+        for text in _strip_end_tag(get_llm_backend().stream(build_prompt(prompt))):
+            if not parts:
+                text = text.lstrip()
+                if not text:
+                    continue
+            parts.append(text)
+            yield text
+    except Exception as e:
+        flights.reject(key, e)
+        st.error(f"API Error: {str(e)}")
+        yield ERROR_RESPONSE
+        return
+    except BaseException:
+        # The consumer went away mid-stream; let followers take over
+        flights.abandon(key)
+        raise
+
+    response_text = "".join(parts).strip()
+    if response_text:
+        cache.put(prompt, response_text)
+    flights.resolve(key, response_text)
+    if not response_text:
+        yield EMPTY_RESPONSE
+
+def _strip_end_tag(chunks: Iterator[str]) -> Iterator[str]:
+    """Drop the closing </assistant> tag even when it is split across chunks"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        if END_TAG in pending:
+            yield pending.split(END_TAG, 1)[0]
+            return
+        # Hold back a trailing prefix of the tag until the next chunk decides it
+        keep = 0
+        for size in range(min(len(END_TAG) - 1, len(pending)), 0, -1):
+            if END_TAG.startswith(pending[-size:]):
+                keep = size
+                break
+        if len(pending) > keep:
+            yield pending[:len(pending) - keep]
+            pending = pending[len(pending) - keep:]
+    if pending:
+        yield pending
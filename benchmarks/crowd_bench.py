@@ -0,0 +1,49 @@
+"""Benchmark the crowd evacuation model against the number of agents.
+
+Evacuates the fire scenario's school hall with increasing crowd sizes and
+reports agent updates per second, wall time and evacuation times.
+
+    python benchmarks/crowd_bench.py --agents 100 500 1000 2000 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crowd import descent_directions, simulate_evacuation
+from pathfinding import RoutePlanner
+from safety_world import RoomWorld, point_object, room_walls
+
+# The fire scenario's classroom scaled up three times, as on the 2D page
+WIDTH, HEIGHT = 30.0, 24.0
+DOORS = [dict(x=[13.5, 16.5], y=[0, 0]), dict(x=[0, 0], y=[9, 12]), dict(x=[30, 30], y=[9, 12])]
+SAFE = [(15, 0), (0, 10.5), (30, 10.5)]
+HAZARDS = [(21, 21), (9, 18), (24, 9)]
+
+def hall_planner() -> RoutePlanner:
+    objects = room_walls(WIDTH, HEIGHT, DOORS)
+    objects += [point_object("hazard", "Hazard", point, 1.5) for point in HAZARDS]
+    objects += [point_object("safe", "Safe Zone", point, 1.5) for point in SAFE]
+    return RoutePlanner(RoomWorld((-1, -1, WIDTH + 1, HEIGHT + 1), objects))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[100, 250, 500, 1000, 2000, 4000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=300.0)
+    args = parser.parse_args()
+
+    planner = hall_planner()
+    directions = descent_directions(planner)
+    print(f"{'agents':>7} {'wall s':>8} {'agent-steps/s':>14} {'median s':>9} {'last out s':>11} {'out':>6}")
+    for agents in args.agents:
+        started = time.perf_counter()
+        result = simulate_evacuation(planner, agents, args.seed, args.max_seconds, directions)
+        wall = time.perf_counter() - started
+        stats = result["stats"]
+        print(f"{agents:>7} {wall:>8.2f} {result['agent_steps_per_second']:>14,.0f} "
+              f"{stats['p50_seconds']:>9.1f} {stats['p100_seconds']:>11.1f} {stats['evacuated']:>6.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark ensemble throughput against the number of worker processes.
+
+Runs the same seeded ensemble inline and on process pools of increasing
+size, reports members per second and speed-up, and checks that every run
+produced identical results.
+
+    python benchmarks/ensemble_bench.py --kind tsunami --members 400 --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ensemble import run_ensemble
+
+PARAMS = {
+    "earthquake": dict(magnitude=6.5, duration=20),
+    "tsunami": dict(trigger="Underwater Earthquake", distance=500, depth=5000, resolution_km=10),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kind", choices=sorted(PARAMS), default="tsunami")
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    params = PARAMS[args.kind]
+
+    started = time.perf_counter()
+    reference = run_ensemble(args.kind, params, args.members, args.seed)
+    inline = time.perf_counter() - started
+    print(f"{args.members} {args.kind} members on {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'wall s':>8} {'members/s':>10} {'speed-up':>9} {'same result':>12}")
+    print(f"{'inline':>8} {inline:>8.2f} {args.members / inline:>10.1f} {1.0:>9.2f} {'yes':>12}")
+
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    for workers in args.workers:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # Warm the pool so process start-up isn't counted
+            list(pool.map(abs, range(workers)))
+            started = time.perf_counter()
+            result = run_ensemble(args.kind, params, args.members, args.seed, pool, workers)
+            wall = time.perf_counter() - started
+        same = np.array_equal(result["scalars"], reference["scalars"], equal_nan=True)
+        print(f"{workers:>8} {wall:>8.2f} {args.members / wall:>10.1f} {inline / wall:>9.2f} {'yes' if same else 'NO':>12}")
+
+if __name__ == "__main__":
+    main()
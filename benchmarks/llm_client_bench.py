@@ -0,0 +1,105 @@
+"""Benchmark AsyncLLMClient against a local stub completion server.
+
+Runs the same burst of requests from many threads (as Streamlit sessions
+would) twice: once opening a fresh connection per request, the way the
+synchronous SDK path did, and once through the shared pooled client.
+
+    python benchmarks/llm_client_bench.py --requests 400 --threads 32 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_client import AsyncLLMClient
+
+def start_stub_server(port: int, latency: float, failure_rate: float) -> str:
+    """Serve /v1/completions on localhost from a background thread"""
+
+    async def completions(request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        if random.random() < failure_rate:
+            return web.Response(status=503, text="try again")
+        text = " Stay calm and follow the safety plan! 🌟"
+        if body.get("stream"):
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            for word in text.split(" "):
+                chunk = {"choices": [{"text": word + " "}]}
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await response.write(b"data: [DONE]\n\n")
+            return response
+        return web.json_response({"choices": [{"text": text}]})
+
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_post("/v1/completions", completions)
+    runner = web.AppRunner(app, access_log=None)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}/v1"
+
+def naive_complete(base_url: str, prompt: str) -> str:
+    payload = json.dumps({"prompt": prompt, "max_tokens": 200}).encode()
+    request = urllib.request.Request(f"{base_url}/completions", data=payload,
+                                     headers={"Content-Type": "application/json", "Connection": "close"})
+    for attempt in range(4):
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return json.load(response)["choices"][0]["text"]
+        except urllib.error.HTTPError:
+            time.sleep(0.05 * 2 ** attempt)
+    return ""
+
+def run(label: str, call, requests: int, threads: int):
+    latencies = []
+
+    def timed(i):
+        start = time.perf_counter()
+        call(f"Question {i % 10}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:<10} {requests / elapsed:8.1f} req/s   "
+          f"p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub server latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.02, help="fraction of 503 replies")
+    parser.add_argument("--concurrency", type=int, default=16, help="client semaphore size")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    base_url = start_stub_server(args.port, args.latency, args.failure_rate)
+    client = AsyncLLMClient(base_url=base_url, api_key="stub", max_concurrency=args.concurrency,
+                            backoff_base=0.05)
+
+    run("naive", lambda p: naive_complete(base_url, p), args.requests, args.threads)
+    run("pooled", client.complete, args.requests, args.threads)
+    run("streamed", lambda p: "".join(client.stream(p)), args.requests, args.threads)
+    print(f"pooled client retries: {client.retries}")
+    client.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the 2-D tsunami solver: grid size versus wall time.
+
+Runs the synthetic coastline scenario at several resolutions and reports
+grid cells, time steps, per-step cost and the relative difference of the
+first coastal arrival and median coastal height from the finest grid, to
+pick resolutions that stay interactive without drifting too far.
+
+    python benchmarks/tsunami_bench.py --distance 500 --depth 5000 --resolutions 10 5 2 1
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tsunami import SOURCE_AMPLITUDE, simulate_propagation, synthetic_bathymetry
+
+def run(distance: float, depth: float, resolution_km: float, trigger: str, repeats: int) -> dict:
+    """Best-of-repeats timing for one resolution"""
+    sea_floor, dx_m, source = synthetic_bathymetry(distance, depth, resolution_km)
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = simulate_propagation(sea_floor, dx_m, source, SOURCE_AMPLITUDE[trigger], time_budget_s=None)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    elapsed, result = best
+    return {
+        "resolution": resolution_km,
+        "cells": sea_floor.size,
+        "shape": sea_floor.shape,
+        "steps": result["steps"],
+        "wall": elapsed,
+        "first_arrival_h": np.nanmin(result["coast_arrival"]) / 3600,
+        "median_height": float(np.median(result["coast_max"])),
+    }
+
+def relative_difference(value: float, reference: float) -> float:
+    """(value - reference) / reference, nan if the reference is zero or missing"""
+    if not np.isfinite(reference) or reference == 0:
+        return float("nan")
+    return (value - reference) / reference
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--distance", type=float, default=500, help="source distance from shore (km)")
+    parser.add_argument("--depth", type=float, default=5000, help="open-ocean depth (m)")
+    parser.add_argument("--resolutions", type=float, nargs="+", default=[10, 5, 2, 1], help="grid spacings (km)")
+    parser.add_argument("--trigger", default="Underwater Earthquake", choices=sorted(SOURCE_AMPLITUDE))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = [run(args.distance, args.depth, res, args.trigger, args.repeats) for res in sorted(args.resolutions, reverse=True)]
+    finest = rows[-1]
+    print(f"{'dx km':>6} {'grid':>11} {'cells':>8} {'steps':>6} {'wall s':>8} {'us/cell-step':>12} "
+          f"{'1st arrival h':>13} {'vs finest':>9} {'median m':>9} {'vs finest':>9}")
+    for row in rows:
+        per_cell_step = row["wall"] / (row["cells"] * max(row["steps"], 1)) * 1e6
+        grid = f"{row['shape'][0]}x{row['shape'][1]}"
+        arrival_error = relative_difference(row["first_arrival_h"], finest["first_arrival_h"])
+        height_error = relative_difference(row["median_height"], finest["median_height"])
+        print(f"{row['resolution']:>6g} {grid:>11} {row['cells']:>8} {row['steps']:>6} {row['wall']:>8.3f} "
+              f"{per_cell_step:>12.4f} {row['first_arrival_h']:>13.2f} {arrival_error:>+9.1%} "
+              f"{row['median_height']:>9.2f} {height_error:>+9.1%}")
+    print(f"\n'vs finest' columns are relative differences from the finest grid ({finest['resolution']:g} km).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import atexit
+import threading
+from collections import Counter
+from typing import Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class WriteBehindCounter:
+    """In-memory counter increments flushed to durable storage in batches.
+
+    increment() only touches a dict under a lock, so a burst of clicks never
+    waits on a database write. A background thread hands the accumulated
+    deltas to flush_fn every interval (or sooner once max_pending keys are
+    waiting). Readers load durable values through read(), which holds off
+    flushes meanwhile, and add the pending deltas it returns to see the live
+    count. If a flush fails its deltas are merged back and retried.
+    """
+
+    def __init__(self, flush_fn: Callable[[Dict[Hashable, int]], None],
+                 interval_seconds: float = 2.0, max_pending: int = 500):
+        self.flush_fn = flush_fn
+        self.interval_seconds = interval_seconds
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, name="write-behind-counter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def increment(self, key: Hashable, amount: int = 1):
+        with self._lock:
+            self._pending[key] += amount
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def read(self, load: Callable[[], T]) -> Tuple[T, Dict[Hashable, int]]:
+        """(load(), pending deltas) with no flush in between, so every delta is
+        counted once: either in what load() read or in the pending ones"""
+        with self._flush_lock:
+            durable = load()
+            with self._lock:
+                return durable, dict(self._pending)
+
+    def flush(self):
+        # One flush at a time so retried deltas can't be applied twice
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, Counter()
+            try:
+                self.flush_fn(dict(batch))
+                self.flushes += 1
+            except Exception:
+                with self._lock:
+                    self._pending.update(batch)
+                raise
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Deltas were put back; try again on the next tick
+                pass
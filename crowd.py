@@ -0,0 +1,179 @@
+import math
+import time
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from pathfinding import RoutePlanner
+
+# Social force model (Helbing & Molnar), per unit mass: each agent relaxes
+# towards walking at DESIRED_SPEED down the distance field and is pushed
+# away from everyone within INTERACTION_RANGE
+DESIRED_SPEED = 1.3  # m/s
+MAX_SPEED = 1.5 * DESIRED_SPEED
+RELAXATION_TIME = 0.5  # s
+BODY_RADIUS = 0.25  # m
+REPULSION_STRENGTH = 25.0  # m/s^2
+REPULSION_RANGE = 0.08  # m
+INTERACTION_RANGE = 1.0  # m, also the neighbour grid cell size
+TIME_STEP = 0.1  # s, so nobody moves more than one occupancy cell per step
+
+DENSITY_CELL = 1.0  # m, heatmap resolution
+EVACUATION_PERCENTILES = (50, 90, 100)
+
+def descent_directions(planner: RoutePlanner) -> np.ndarray:
+    """Unit vector (x, y) from every cell towards its lowest 8-neighbour in the
+    distance field, zero at targets and where nothing is lower"""
+    dist = planner.dist
+    rows, cols = dist.shape
+    padded = np.pad(dist, 1, constant_values=np.inf)
+    best = dist.copy()
+    directions = np.zeros((rows, cols, 2))
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if not (dr or dc):
+                continue
+            shifted = padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+            lower = shifted < best
+            best = np.where(lower, shifted, best)
+            directions[lower] = np.array([dc, dr]) / math.hypot(dr, dc)
+    return directions
+
+def neighbour_table(cells: np.ndarray, n_cells: int) -> np.ndarray:
+    """(n_cells, k) agent indices per grid cell, padded with -1; k is the fullest cell"""
+    order = np.argsort(cells, kind="stable")
+    counts = np.bincount(cells, minlength=n_cells)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_cells = cells[order]
+    rank = np.arange(len(cells)) - starts[sorted_cells]
+    table = np.full((n_cells, max(int(counts.max(initial=0)), 1)), -1)
+    table[sorted_cells, rank] = order
+    return table
+
+def repulsion(pos: np.ndarray, grid_origin: Tuple[float, float], grid_shape: Tuple[int, int]) -> np.ndarray:
+    """Sum of pairwise pushes on every agent from agents within INTERACTION_RANGE.
+
+    Agents are binned into a grid of INTERACTION_RANGE cells, so each one
+    only looks at the agents in its own and the 8 surrounding cells: cost
+    grows with agents x local density rather than agents squared.
+    """
+    n = len(pos)
+    gx = np.clip(((pos[:, 0] - grid_origin[0]) // INTERACTION_RANGE).astype(int), 0, grid_shape[1] - 1)
+    gy = np.clip(((pos[:, 1] - grid_origin[1]) // INTERACTION_RANGE).astype(int), 0, grid_shape[0] - 1)
+    # One spare cell on every side so the 3x3 neighbourhood never leaves the table
+    stride = grid_shape[1] + 2
+    cells = (gy + 1) * stride + gx + 1
+    table = neighbour_table(cells, (grid_shape[0] + 2) * stride)
+    offsets = np.array([dy * stride + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+    candidates = table[cells[:, None] + offsets[None, :]].reshape(n, -1)
+
+    valid = (candidates >= 0) & (candidates != np.arange(n)[:, None])
+    others = pos[np.where(valid, candidates, 0)]
+    diff = pos[:, None, :] - others
+    d = np.maximum(np.hypot(diff[..., 0], diff[..., 1]), 1e-3)
+    valid &= d < INTERACTION_RANGE
+    push = np.where(valid, REPULSION_STRENGTH * np.exp((2 * BODY_RADIUS - d) / REPULSION_RANGE) / d, 0.0)
+    return (push[..., None] * diff).sum(axis=1)
+
+def spawn_agents(planner: RoutePlanner, agents: int, rng: np.random.Generator) -> np.ndarray:
+    """Random positions on walkable, hazard-free cells that have a way to safety"""
+    world = planner.world
+    free = np.isfinite(planner.dist) & (planner.dist > 0) & (planner.cost == 1.0)
+    rows, cols = np.nonzero(free)
+    picks = rng.integers(len(rows), size=agents)
+    # Jitter within the cell keeps every agent nearest to the cell it was put on
+    jitter = rng.uniform(-0.45, 0.45, size=(agents, 2)) * world.cell_size
+    return np.column_stack((world.x_min + cols[picks] * world.cell_size,
+                            world.y_min + rows[picks] * world.cell_size)) + jitter
+
+def simulate_evacuation(planner: RoutePlanner, agents: int, seed: int = 0,
+                        max_seconds: float = 300.0, directions: Optional[np.ndarray] = None) -> Dict:
+    """Move a crowd to the planner's targets with the social force model.
+
+    All agent state lives in (agents, 2) position/velocity arrays updated
+    together each TIME_STEP; an agent leaves the simulation once it stands
+    in a target cell. Moves into walls slide along them or are cancelled.
+
+    Returns per-agent "exit_times" (s, nan if still inside at max_seconds),
+    the "timeline" of agents out over "times", the mean and peak "density"
+    (agents per m^2) on a DENSITY_CELL grid with edges "x_edges"/"y_edges",
+    summary "stats" and the "agent_steps_per_second" achieved.
+    """
+    world = planner.world
+    rng = np.random.default_rng(seed)
+    if directions is None:
+        directions = descent_directions(planner)
+    pos = spawn_agents(planner, agents, rng)
+    vel = np.zeros_like(pos)
+    ids = np.arange(agents)
+    exit_times = np.full(agents, np.nan)
+
+    grid_shape = (int(math.ceil((world.y_max - world.y_min) / INTERACTION_RANGE)) + 1,
+                  int(math.ceil((world.x_max - world.x_min) / INTERACTION_RANGE)) + 1)
+    x_edges = np.arange(world.x_min, world.x_max + DENSITY_CELL, DENSITY_CELL)
+    y_edges = np.arange(world.y_min, world.y_max + DENSITY_CELL, DENSITY_CELL)
+    occupancy = np.zeros((len(y_edges) - 1, len(x_edges) - 1))
+    peak = np.zeros_like(occupancy)
+
+    def cells_of(points):
+        row = np.clip(np.rint((points[:, 1] - world.y_min) / world.cell_size).astype(int), 0, world.rows - 1)
+        col = np.clip(np.rint((points[:, 0] - world.x_min) / world.cell_size).astype(int), 0, world.cols - 1)
+        return row, col
+
+    steps = int(math.ceil(max_seconds / TIME_STEP))
+    times = np.arange(steps + 1) * TIME_STEP
+    timeline = np.zeros(steps + 1, dtype=int)
+    started = time.perf_counter()
+    agent_steps = 0
+    step = 0
+    for step in range(1, steps + 1):
+        if not len(pos):
+            timeline[step:] = agents
+            break
+        agent_steps += len(pos)
+        row, col = cells_of(pos)
+        force = (DESIRED_SPEED * directions[row, col] - vel) / RELAXATION_TIME
+        force += repulsion(pos, (world.x_min, world.y_min), grid_shape)
+        vel += force * TIME_STEP
+        speed = np.hypot(vel[:, 0], vel[:, 1])
+        vel *= np.minimum(1.0, MAX_SPEED / np.maximum(speed, 1e-9))[:, None]
+
+        # Take the full move if it is free, else slide along the wall on one
+        # axis, else stop
+        target = pos + vel * TIME_STEP
+        free = ~world.blocked[cells_of(target)]
+        slide_x = np.column_stack((target[:, 0], pos[:, 1]))
+        use_x = ~free & ~world.blocked[cells_of(slide_x)]
+        slide_y = np.column_stack((pos[:, 0], target[:, 1]))
+        use_y = ~free & ~use_x & ~world.blocked[cells_of(slide_y)]
+        pos = np.where(free[:, None], target, pos)
+        pos[use_x], vel[use_x, 1] = slide_x[use_x], 0.0
+        pos[use_y], vel[use_y, 0] = slide_y[use_y], 0.0
+        vel[~(free | use_x | use_y)] = 0.0
+
+        # Density of everyone still inside, then let out whoever reached safety
+        counts, _, _ = np.histogram2d(pos[:, 1], pos[:, 0], bins=(y_edges, x_edges))
+        occupancy += counts
+        np.maximum(peak, counts, out=peak)
+        row, col = cells_of(pos)
+        out = planner.dist[row, col] == 0
+        exit_times[ids[out]] = times[step]
+        pos, vel, ids = pos[~out], vel[~out], ids[~out]
+        timeline[step] = agents - len(pos)
+    wall = time.perf_counter() - started
+
+    done = exit_times[np.isfinite(exit_times)]
+    stats = {"evacuated": float(len(done) / max(agents, 1))}
+    for q in EVACUATION_PERCENTILES:
+        stats[f"p{q}_seconds"] = float(np.percentile(done, q)) if len(done) else math.nan
+    area = DENSITY_CELL ** 2
+    return {
+        "exit_times": exit_times,
+        "times": times[:step + 1],
+        "timeline": timeline[:step + 1],
+        "density": occupancy / max(step, 1) / area,
+        "peak_density": peak / area,
+        "x_edges": x_edges,
+        "y_edges": y_edges,
+        "stats": stats,
+        "agent_steps_per_second": agent_steps / wall if wall > 0 else math.inf,
+    }
@@ -0,0 +1,141 @@
+import math
+import numpy as np
+from concurrent.futures import Executor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Sequence, Tuple
+
+from seismic import DEFAULT_STATION_DISTANCES_KM, synthetic_seismograms
+from tsunami import SOURCE_AMPLITUDE, simulate_propagation, synthetic_bathymetry
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Spread of the uncertain inputs
+MAGNITUDE_SIGMA = 0.2
+QUAKE_DEPTH_RANGE_KM = (5.0, 20.0)
+ENVELOPE_RATE_HZ = 10
+DEPTH_LOG_SIGMA = 0.15
+DISTANCE_SIGMA = 0.1
+AMPLITUDE_LOG_SIGMA = 0.3
+
+def earthquake_member(rng: np.random.Generator, magnitude: float, duration: int) -> Tuple[np.ndarray, np.ndarray]:
+    """One perturbed earthquake: peak displacement (mm) per station, and the
+    shaking envelope at the nearest station sampled at ENVELOPE_RATE_HZ"""
+    time, traces, _ = synthetic_seismograms(
+        rng.normal(magnitude, MAGNITUDE_SIGMA), duration, DEFAULT_STATION_DISTANCES_KM,
+        seed=rng, depth_km=rng.uniform(*QUAKE_DEPTH_RANGE_KM)
+    )
+    peaks = np.abs(traces).max(axis=1)
+    window = int(round(len(time) / (duration * ENVELOPE_RATE_HZ)))
+    envelope = np.abs(traces[0, :window * duration * ENVELOPE_RATE_HZ]).reshape(-1, window).max(axis=1)
+    return peaks, envelope
+
+def tsunami_member(rng: np.random.Generator, trigger: str, distance: float, depth: float,
+                   resolution_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """One perturbed tsunami: (first coastal arrival h, highest coastal wave m),
+    and the highest wave along the coast, one value per grid row"""
+    member_depth = depth * rng.lognormal(0.0, DEPTH_LOG_SIGMA)
+    member_distance = max(distance * rng.normal(1.0, DISTANCE_SIGMA), 0.0)
+    amplitude = SOURCE_AMPLITUDE[trigger] * rng.lognormal(0.0, AMPLITUDE_LOG_SIGMA)
+    sea_floor, dx_m, source = synthetic_bathymetry(member_distance, member_depth, resolution_km)
+    run = simulate_propagation(sea_floor, dx_m, source, amplitude, time_budget_s=None)
+
+    profile = np.zeros(sea_floor.shape[0])
+    np.maximum.at(profile, run["coast"][0], run["coast_max"])
+    arrivals = run["coast_arrival"]
+    first = np.nanmin(arrivals) / 3600 if np.isfinite(arrivals).any() else np.nan
+    return np.array([first, run["coast_max"].max()]), profile
+
+MEMBERS = {
+    "earthquake": earthquake_member,
+    "tsunami": tsunami_member,
+}
+
+def member_rng(seed: int, index: int) -> np.random.Generator:
+    """Generator for member index: the index-th child of SeedSequence(seed),
+    so a member's draws don't depend on how the ensemble was chunked"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+def _run_chunk(kind: str, params: dict, seed: int, start: int, stop: int,
+               scalars_name: str, profiles_name: str, shapes: Tuple[tuple, tuple]) -> int:
+    """Worker: run members start..stop-1 and write them into the shared result blocks"""
+    scalars_shm = shared_memory.SharedMemory(name=scalars_name)
+    profiles_shm = shared_memory.SharedMemory(name=profiles_name)
+    scalars = profiles = None
+    try:
+        scalars = np.ndarray(shapes[0], dtype=np.float64, buffer=scalars_shm.buf)
+        profiles = np.ndarray(shapes[1], dtype=np.float64, buffer=profiles_shm.buf)
+        for index in range(start, stop):
+            scalars[index], profiles[index] = MEMBERS[kind](member_rng(seed, index), **params)
+    finally:
+        del scalars, profiles
+        scalars_shm.close()
+        profiles_shm.close()
+    return stop - start
+
+def run_ensemble(kind: str, params: dict, members: int, seed: int = 0,
+                 executor: Optional[Executor] = None, workers: int = 1,
+                 thresholds: Sequence[float] = ()) -> Dict:
+    """Run `members` perturbed simulations and summarise them.
+
+    Members are split into chunks and handed to executor (a process pool,
+    or run inline if None); each worker writes its rows straight into
+    shared-memory arrays, so results never travel back through pickling.
+    Member i always uses the i-th child of SeedSequence(seed), so a seed
+    reproduces the ensemble whatever the number of workers.
+
+    Returns the raw "scalars" (members, k) and "profiles" (members, m),
+    their "scalar_bands" and "profile_bands" at PERCENTILES, and
+    "exceedance": for each threshold, the fraction of members whose scalar
+    outputs exceed it.
+    """
+    member = MEMBERS[kind]
+    # One inline run tells us the output sizes to allocate
+    probe_scalars, probe_profile = member(member_rng(seed, 0), **params)
+    shapes = ((members, len(probe_scalars)), (members, len(probe_profile)))
+    blocks = [shared_memory.SharedMemory(create=True, size=max(math.prod(shape) * 8, 1)) for shape in shapes]
+    scalar_view = profile_view = None
+    try:
+        scalar_view = np.ndarray(shapes[0], dtype=np.float64, buffer=blocks[0].buf)
+        profile_view = np.ndarray(shapes[1], dtype=np.float64, buffer=blocks[1].buf)
+        scalar_view[0], profile_view[0] = probe_scalars, probe_profile
+
+        # A few chunks per worker keeps every core busy to the end
+        chunk = max(math.ceil((members - 1) / (max(workers, 1) * 4)), 1)
+        bounds = [(start, min(start + chunk, members)) for start in range(1, members, chunk)]
+        args = (kind, params, seed)
+        names = (blocks[0].name, blocks[1].name)
+        if executor is None:
+            for start, stop in bounds:
+                _run_chunk(*args, start, stop, *names, shapes)
+        else:
+            futures = [executor.submit(_run_chunk, *args, start, stop, *names, shapes) for start, stop in bounds]
+            for future in futures:
+                future.result()
+        scalars = scalar_view.copy()
+        profiles = profile_view.copy()
+    finally:
+        # Views must go before the blocks can be closed
+        del scalar_view, profile_view
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return {
+        "scalars": scalars,
+        "profiles": profiles,
+        "scalar_bands": np.nanpercentile(scalars, PERCENTILES, axis=0),
+        "profile_bands": np.nanpercentile(profiles, PERCENTILES, axis=0),
+        "exceedance": exceedance(scalars, thresholds),
+    }
+
+def exceedance(scalars: np.ndarray, thresholds: Sequence[float]) -> np.ndarray:
+    """(thresholds, k) fraction of members whose scalar outputs exceed each threshold"""
+    return (scalars[None, :, :] > np.asarray(thresholds, dtype=float)[:, None, None]).mean(axis=1)
+
+def spread_thresholds(values: np.ndarray, count: int, margin: float = 2.0) -> np.ndarray:
+    """count log-spaced thresholds from the 5th to the 95th percentile of
+    positive values, widened by a factor margin each way so an exceedance
+    curve over them runs from near 100% to near 0% at any scale"""
+    low, high = np.nanpercentile(values, (PERCENTILES[0], PERCENTILES[-1]))
+    low = max(float(low), np.finfo(float).tiny)
+    return np.geomspace(low / margin, max(float(high), low) * margin, count)
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from safety_world import Point, RoomWorld
+
+# Fire: every burning neighbour (diagonals at half weight) adds heat to a
+# cell each step; it catches once the heat passes its ignition threshold,
+# drawn per cell so fronts come out ragged, then burns through its fuel
+IGNITION_RANGE = (1.5, 3.5)
+DIAGONAL_WEIGHT = 0.5
+BURN_RATE = 0.05  # fuel used per step, so a cell burns for 20 steps
+
+# Smoke: burning cells give off smoke, which spreads by diffusion (walls
+# don't let it through), fades slowly and vents away outside the room
+SMOKE_RATE = 0.1
+SMOKE_DIFFUSION = 0.2  # per substep; explicit diffusion needs < 0.25
+SMOKE_SUBSTEPS = 4
+SMOKE_DECAY = 0.01
+SMOKE_DANGER = 0.4  # thick enough that standing in it counts as a hazard
+SMOKE_VISIBLE = 1e-3  # thinner smoke is ignored and left out of the active box
+
+def neighbour_sum(a: np.ndarray, diagonal_weight: float = 0.0) -> np.ndarray:
+    """3x3 convolution-style sum of each cell's 4 neighbours plus its
+    diagonals times diagonal_weight, with zeros beyond the edge"""
+    p = np.pad(a, 1)
+    total = p[:-2, 1:-1] + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:]
+    if diagonal_weight:
+        total = total + diagonal_weight * (p[:-2, :-2] + p[:-2, 2:] + p[2:, :-2] + p[2:, 2:])
+    return total
+
+class FireSpread:
+    """Cellular automaton of fire and smoke on a RoomWorld's occupancy grid.
+
+    Each call to step() advances every cell at once with shifted-array
+    neighbour sums. Only the bounding box around burning cells and visible
+    smoke, grown by how far anything can spread in one step, is updated, so
+    a step costs the size of the fire rather than the size of the map.
+    """
+
+    def __init__(self, world: RoomWorld, seeds: np.ndarray, fuel: Optional[np.ndarray] = None, seed: int = 0):
+        self.world = world
+        self.walls = world.blocked
+        # Fire only burns where there is fuel; open cells without any vent smoke
+        self.fuel = (~self.walls if fuel is None else fuel & ~self.walls).astype(float)
+        self.vent = ~self.walls & (self.fuel == 0)
+        self.threshold = np.random.default_rng(seed).uniform(*IGNITION_RANGE, size=self.walls.shape)
+        self.heat = np.zeros(self.walls.shape)
+        self.burning = seeds & (self.fuel > 0)
+        self.smoke = np.zeros(self.walls.shape)
+        self.steps = 0
+
+    def active_box(self) -> Optional[Tuple[slice, slice]]:
+        """Rows and columns that can change in the next step, or None if the fire is out"""
+        active = self.burning | (self.smoke > SMOKE_VISIBLE)
+        if not active.any():
+            return None
+        rows = np.flatnonzero(active.any(axis=1))
+        cols = np.flatnonzero(active.any(axis=0))
+        margin = SMOKE_SUBSTEPS + 1
+        return (slice(max(rows[0] - margin, 0), rows[-1] + margin + 1),
+                slice(max(cols[0] - margin, 0), cols[-1] + margin + 1))
+
+    def step(self) -> None:
+        """Advance fire and smoke by one step"""
+        self.steps += 1
+        box = self.active_box()
+        if box is None:
+            return
+        burning = self.burning[box]
+        fuel = self.fuel[box]
+        open_cells = (~self.walls[box]).astype(float)
+
+        # Fire: heat from burning neighbours, ignition, then burn-out
+        heat = self.heat[box]
+        heat += neighbour_sum(burning.astype(float), DIAGONAL_WEIGHT)
+        ignite = (heat >= self.threshold[box]) & (fuel > 0) & ~burning
+        fuel -= BURN_RATE * burning
+        np.maximum(fuel, 0.0, out=fuel)
+        self.burning[box] = (burning | ignite) & (fuel > 0)
+
+        # Smoke: source, no-flux diffusion around walls, decay and venting
+        smoke = self.smoke[box]
+        smoke += SMOKE_RATE * burning
+        open_neighbours = neighbour_sum(open_cells)
+        for _ in range(SMOKE_SUBSTEPS):
+            flux = neighbour_sum(smoke * open_cells) - open_neighbours * smoke
+            smoke += SMOKE_DIFFUSION * flux * open_cells
+        smoke *= 1.0 - SMOKE_DECAY
+        np.minimum(smoke, 1.0, out=smoke)
+        smoke[self.vent[box]] = 0.0
+
+    @property
+    def hazard(self) -> np.ndarray:
+        """Cells that are on fire or full of thick smoke"""
+        return self.burning | (self.smoke > SMOKE_DANGER)
+
+    def in_hazard(self, point: Point) -> bool:
+        row, col = self.world.cell(point)
+        if not (0 <= row < self.walls.shape[0] and 0 <= col < self.walls.shape[1]):
+            return False
+        return bool(self.hazard[row, col])
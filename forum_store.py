@@ -0,0 +1,232 @@
+import datetime
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    content TEXT NOT NULL,
+    author TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    likes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_posts_category ON posts (category, id);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    post_id INTEGER NOT NULL REFERENCES posts (id),
+    author TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_comments_post ON comments (post_id, id);
+"""
+
+# Full-text index over each post's title, content and all of its comments,
+# kept in step with the base tables by triggers (rowid = post id)
+SEARCH_SCHEMA = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content, comments, tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts (rowid, title, content, comments) VALUES (new.id, new.title, new.content, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_comment AFTER INSERT ON comments BEGIN
+        UPDATE posts_fts SET comments = comments || ' ' || new.content WHERE rowid = new.post_id;
+    END""",
+)
+
+# Post counts per category, maintained on insert so filters never count rows
+CATEGORY_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS category_counts (
+        category TEXT PRIMARY KEY,
+        posts INTEGER NOT NULL
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS category_counts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO category_counts (category, posts) VALUES (new.category, 1)
+        ON CONFLICT (category) DO UPDATE SET posts = posts + 1;
+    END""",
+)
+
+# Relative weights of title, content and comments in BM25 ranking
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0)
+SCHEMA_VERSION = 2
+
+class ForumStore:
+    """Community posts, comments and likes in SQLite, shared by every session.
+
+    Uses one connection per thread with WAL journaling, like the leaderboard
+    store. Posts come back as dicts shaped like the old session-state posts
+    (title, category, content, author, timestamp, likes, comments) plus
+    their id.
+    """
+
+    def __init__(self, path: str = 'forum.db'):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create_post(self, title: str, category: str, content: str, author: str = "Anonymous") -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "INSERT INTO posts (title, category, content, author, created_at) VALUES (?, ?, ?, ?, ?)",
+                (title, category, content, author, _now())
+            ).lastrowid
+
+    def add_comment(self, post_id: int, content: str, author: str = "Anonymous") -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "INSERT INTO comments (post_id, author, content, created_at) VALUES (?, ?, ?, ?)",
+                (post_id, author, content, _now())
+            ).lastrowid
+
+    def like(self, post_id: int):
+        with self._connect() as conn:
+            conn.execute("UPDATE posts SET likes = likes + 1 WHERE id = ?", (post_id,))
+
+    def apply_like_deltas(self, deltas: Dict[int, int]):
+        """Add a batch of accumulated likes in one transaction"""
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE posts SET likes = likes + ? WHERE id = ?",
+                [(amount, post_id) for post_id, amount in deltas.items()]
+            )
+
+    def count_posts(self, category: Optional[str] = None) -> int:
+        counts = self.category_counts()
+        return sum(counts.values()) if category is None else counts.get(category, 0)
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of posts in each category, from the maintained counts table"""
+        rows = self._connect().execute("SELECT category, posts FROM category_counts").fetchall()
+        return {row["category"]: row["posts"] for row in rows}
+
+    def get_post(self, post_id: int) -> Optional[Dict]:
+        """One post and its comments, looked up by primary key"""
+        row = self._connect().execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+        if row is None:
+            return None
+        return self._with_comments([row])[0]
+
+    def list_posts(self, category: Optional[str] = None, before_id: Optional[int] = None,
+                   limit: int = 10) -> List[Dict]:
+        """Posts newest first, with their comments attached.
+
+        Pages are addressed by a cursor (the id of the last post on the
+        previous page) rather than an offset, so new posts arriving at the
+        top never shift the pages a reader is walking through. A category
+        filter walks only that category's (category, id) index range.
+        """
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM posts {where} ORDER BY id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return self._with_comments(rows)
+
+    def search_posts(self, query: str, page: int = 1, page_size: int = 10) -> Tuple[List[Dict], int]:
+        """Ranked full-text search over titles, content and comments.
+
+        Every word in the query must match, and each word also matches as a
+        prefix ("earth" finds "earthquake"). Returns one page of posts,
+        best BM25 score first, and the total number of matches.
+        """
+        match = build_match_query(query)
+        if not match:
+            return [], 0
+        conn = self._connect()
+        total = conn.execute("SELECT COUNT(*) FROM posts_fts WHERE posts_fts MATCH ?", (match,)).fetchone()[0]
+        rows = conn.execute(
+            "SELECT posts.* FROM posts_fts JOIN posts ON posts.id = posts_fts.rowid "
+            "WHERE posts_fts MATCH ? ORDER BY bm25(posts_fts, ?, ?, ?) LIMIT ? OFFSET ?",
+            (match, *SEARCH_WEIGHTS, page_size, (max(page, 1) - 1) * page_size)
+        ).fetchall()
+        return self._with_comments(rows), total
+
+    def _migrate(self):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            if version < 1:
+                # Build the search index for posts written before it existed
+                for statement in SEARCH_SCHEMA:
+                    conn.execute(statement)
+                conn.execute("DELETE FROM posts_fts")
+                conn.execute(
+                    "INSERT INTO posts_fts (rowid, title, content, comments) "
+                    "SELECT posts.id, posts.title, posts.content, "
+                    "COALESCE((SELECT group_concat(content, ' ') FROM comments WHERE post_id = posts.id), '') "
+                    "FROM posts"
+                )
+            if version < 2:
+                # Seed per-category counts from existing posts
+                for statement in CATEGORY_SCHEMA:
+                    conn.execute(statement)
+                conn.execute("DELETE FROM category_counts")
+                conn.execute(
+                    "INSERT INTO category_counts (category, posts) SELECT category, COUNT(*) FROM posts GROUP BY category"
+                )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _with_comments(self, rows: List[sqlite3.Row]) -> List[Dict]:
+        posts = [_post_from_row(row) for row in rows]
+        if not posts:
+            return posts
+        by_id = {post["id"]: post for post in posts}
+        placeholders = ",".join("?" * len(by_id))
+        for row in self._connect().execute(
+            f"SELECT * FROM comments WHERE post_id IN ({placeholders}) ORDER BY id", list(by_id)
+        ):
+            by_id[row["post_id"]]["comments"].append(_comment_from_row(row))
+        return posts
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word required, each as a prefix"""
+    words = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+def _post_from_row(row: sqlite3.Row) -> Dict:
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "category": row["category"],
+        "content": row["content"],
+        "author": row["author"],
+        "timestamp": datetime.datetime.fromisoformat(row["created_at"]),
+        "likes": row["likes"],
+        "comments": [],
+    }
+
+def _comment_from_row(row: sqlite3.Row) -> Dict:
+    return {
+        "id": row["id"],
+        "author": row["author"],
+        "content": row["content"],
+        "timestamp": datetime.datetime.fromisoformat(row["created_at"]),
+    }
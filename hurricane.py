@@ -0,0 +1,179 @@
+import numpy as np
+from typing import Dict, Tuple
+
+AIR_DENSITY = 1.15  # kg/m^3
+WATER_DENSITY = 1025.0
+GRAVITY = 9.81
+CORIOLIS = 2 * 7.292e-5 * np.sin(np.radians(25.0))  # f at 25 degrees north
+MPS_TO_MPH = 2.23694
+M_TO_FEET = 3.28084
+
+# Storm for each intensity level on the Hurricane tab: peak sustained wind
+# (m/s), central pressure drop (hPa) and radius of maximum winds (km)
+STORMS = {
+    "Low": {"vmax": 38.0, "pressure_drop": 25.0, "rmax_km": 50.0},
+    "Moderate": {"vmax": 50.0, "pressure_drop": 50.0, "rmax_km": 40.0},
+    "High": {"vmax": 64.0, "pressure_drop": 75.0, "rmax_km": 30.0},
+    "Extreme": {"vmax": 78.0, "pressure_drop": 100.0, "rmax_km": 25.0},
+}
+
+# Map and track: the storm starts offshore in the south and is steered
+# north-west onto a coastline that runs east-west with gentle bays
+DOMAIN_KM = (800.0, 600.0)
+COAST_KM = 450.0
+COAST_WAVE_KM = 30.0
+TRACK_START_KM = (560.0, 60.0)
+STEERING_MPS = (-2.5, 5.5)
+TRACK_HOURS = 36
+INFLOW_ANGLE = np.radians(20.0)
+
+# Kaplan & DeMaria (1995) decay over land: V = Vb + (R V0 - Vb) exp(-a t)
+LAND_DECAY_PER_HOUR = 0.095
+LAND_BACKGROUND_MPS = 13.75
+LANDFALL_REDUCTION = 0.9
+
+# Shelf used for the wind setup part of the surge
+SHELF_WIDTH_KM = 60.0
+SHELF_DEPTH_M = 15.0
+
+def coastline(x_km: np.ndarray) -> np.ndarray:
+    """North-south position (km) of the coast at each east-west position"""
+    return COAST_KM + COAST_WAVE_KM * np.sin(2 * np.pi * x_km / DOMAIN_KM[0])
+
+def holland_b(vmax: float, pressure_drop_hpa: float) -> float:
+    """Holland's shape parameter from peak wind: Vmax = sqrt(B dp / (rho e))"""
+    return float(np.clip(AIR_DENSITY * np.e * vmax ** 2 / (pressure_drop_hpa * 100.0), 1.0, 2.5))
+
+def holland_wind(r_km: np.ndarray, rmax_km: float, pressure_drop_hpa: float, b: float) -> np.ndarray:
+    """Holland (1980) gradient wind speed (m/s) at distance r from the eye"""
+    r = np.maximum(r_km, 0.1) * 1000.0
+    scaled = (rmax_km * 1000.0 / r) ** b
+    half_fr = 0.5 * r * CORIOLIS
+    return np.sqrt(b / AIR_DENSITY * scaled * pressure_drop_hpa * 100.0 * np.exp(-scaled) + half_fr ** 2) - half_fr
+
+def pressure_deficit(r_km: np.ndarray, rmax_km: float, pressure_drop_hpa: float, b: float) -> np.ndarray:
+    """How far below ambient the surface pressure is (hPa) at distance r"""
+    return pressure_drop_hpa * (1.0 - np.exp(-(rmax_km / np.maximum(r_km, 0.1)) ** b))
+
+def storm_track(intensity: str, hours: int = TRACK_HOURS) -> Dict[str, np.ndarray]:
+    """Hourly eye position, peak wind and pressure drop along the track.
+
+    The eye moves with a constant steering current. Once it crosses the
+    coast the peak wind decays towards a weak background value, and the
+    pressure drop shrinks with it so the profile keeps its shape.
+    """
+    storm = STORMS[intensity]
+    b = holland_b(storm["vmax"], storm["pressure_drop"])
+    t = np.arange(hours + 1, dtype=float)
+    x = TRACK_START_KM[0] + STEERING_MPS[0] * 3.6 * t
+    y = TRACK_START_KM[1] + STEERING_MPS[1] * 3.6 * t
+
+    over_land = y > coastline(x)
+    vmax = np.full(t.shape, storm["vmax"])
+    if over_land.any():
+        landfall = int(np.argmax(over_land))
+        hours_inland = t[landfall:] - t[landfall]
+        start = LANDFALL_REDUCTION * storm["vmax"]
+        vmax[landfall:] = LAND_BACKGROUND_MPS + (start - LAND_BACKGROUND_MPS) * \
+            np.exp(-LAND_DECAY_PER_HOUR * hours_inland)
+    pressure_drop = storm["pressure_drop"] * (vmax / storm["vmax"]) ** 2
+    return {"hours": t, "x": x, "y": y, "vmax": vmax, "pressure_drop": pressure_drop,
+            "over_land": over_land, "b": np.full(t.shape, b)}
+
+def _wind(dx: np.ndarray, dy: np.ndarray, track: Dict[str, np.ndarray],
+          rmax_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(u, v, speed) for offsets (km) from the eye; track arrays broadcast on axis 0"""
+    extra = (slice(None),) + (None,) * (dx.ndim - 1)
+    r = np.hypot(dx, dy)
+    speed = holland_wind(r, rmax_km, track["pressure_drop"][extra], track["b"][extra])
+
+    # Unit tangent (anticlockwise) rotated towards the eye
+    safe_r = np.maximum(r, 1e-6)
+    cos_a, sin_a = np.cos(INFLOW_ANGLE), np.sin(INFLOW_ANGLE)
+    u = speed * ((-dy * cos_a - dx * sin_a) / safe_r)
+    v = speed * ((dx * cos_a - dy * sin_a) / safe_r)
+
+    # Forward motion fades out away from the core
+    blend = 0.5 * np.exp(-r / (4 * rmax_km))
+    u += blend * STEERING_MPS[0]
+    v += blend * STEERING_MPS[1]
+    return u, v, np.hypot(u, v)
+
+def wind_field(x_km: np.ndarray, y_km: np.ndarray, track: Dict[str, np.ndarray],
+               rmax_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Surface wind (u, v, speed) in m/s at every track hour, shape (hours, ny, nx).
+
+    Winds circle the eye anticlockwise, turned inward by the inflow angle,
+    with half the storm's forward motion added so the right-hand side of
+    the track blows hardest.
+    """
+    dx = x_km[None, None, :] - track["x"][:, None, None]
+    dy = y_km[None, :, None] - track["y"][:, None, None]
+    return _wind(dx, dy, track, rmax_km)
+
+def wind_at_points(px_km: np.ndarray, py_km: np.ndarray, track: Dict[str, np.ndarray],
+                   rmax_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Like wind_field, but at scattered points: shape (hours, points)"""
+    dx = px_km[None, :] - track["x"][:, None]
+    dy = py_km[None, :] - track["y"][:, None]
+    return _wind(dx, dy, track, rmax_km)
+
+def drag_coefficient(speed: np.ndarray) -> np.ndarray:
+    """Garratt's sea-surface drag coefficient, capped for hurricane winds"""
+    return np.minimum((0.75 + 0.067 * speed) * 1e-3, 2.5e-3)
+
+def storm_surge(u: np.ndarray, v: np.ndarray, deficit_hpa: np.ndarray,
+                normal: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """Surge height (m) at coast points from onshore wind setup plus low pressure.
+
+    Wind setup is the bathystrophic balance over a uniform shelf,
+    tau L / (rho_w g h), counting only the onshore part of the wind stress;
+    low pressure lifts the sea by about 1 cm per hPa.
+    """
+    speed = np.hypot(u, v)
+    onshore = u * normal[0] + v * normal[1]
+    stress = AIR_DENSITY * drag_coefficient(speed) * speed * np.maximum(onshore, 0.0)
+    setup = stress * SHELF_WIDTH_KM * 1000.0 / (WATER_DENSITY * GRAVITY * SHELF_DEPTH_M)
+    return setup + 0.01 * deficit_hpa
+
+def simulate_hurricane(intensity: str, resolution_km: float = 10.0, hours: int = TRACK_HOURS) -> Dict:
+    """Wind maps for every hour of the track plus the surge along the coast.
+
+    Returns grid axes "x"/"y" (km), "speed" (hours, ny, nx) m/s, the
+    "swath" of highest wind at each point, the "track", the coastline
+    ("coast_x", "coast_y") with peak "surge" (m) along it, and headline
+    numbers for the page.
+    """
+    storm = STORMS[intensity]
+    x = np.arange(0.0, DOMAIN_KM[0] + resolution_km / 2, resolution_km)
+    y = np.arange(0.0, DOMAIN_KM[1] + resolution_km / 2, resolution_km)
+    track = storm_track(intensity, hours)
+    _, _, speed = wind_field(x, y, track, storm["rmax_km"])
+
+    # Coast points and their landward unit normals
+    coast_x = x
+    coast_y = coastline(coast_x)
+    slope = np.gradient(coast_y, coast_x)
+    norm = np.hypot(slope, 1.0)
+    normal = (-slope / norm, 1.0 / norm)
+    cu, cv, _ = wind_at_points(coast_x, coast_y, track, storm["rmax_km"])
+    r = np.hypot(coast_x[None, :] - track["x"][:, None], coast_y[None, :] - track["y"][:, None])
+    deficit = pressure_deficit(r, storm["rmax_km"], track["pressure_drop"][:, None], track["b"][:, None])
+    surge = storm_surge(cu, cv, deficit, (normal[0][None, :], normal[1][None, :])).max(axis=0)
+
+    land = y[:, None] > coastline(x)[None, :]
+    landfall = int(np.argmax(track["over_land"])) if track["over_land"].any() else None
+    return {
+        "x": x,
+        "y": y,
+        "land": land,
+        "speed": speed.astype(np.float32),
+        "swath": speed.max(axis=0),
+        "track": track,
+        "coast_x": coast_x,
+        "coast_y": coast_y,
+        "surge": surge,
+        "landfall_hour": landfall,
+        "peak_wind_mph": float(speed.max() * MPS_TO_MPH),
+        "peak_surge_feet": float(surge.max() * M_TO_FEET),
+    }
@@ -0,0 +1,273 @@
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    disaster_type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score_date ON scores (score DESC, date DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS score_rollups (
+    category TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    PRIMARY KEY (category, period, bucket)
+);
+CREATE TABLE IF NOT EXISTS bucket_top (
+    category TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    score_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (category, period, bucket, score_id)
+);
+CREATE INDEX IF NOT EXISTS idx_bucket_top_rank ON bucket_top (category, period, bucket, score DESC, date DESC);
+"""
+
+# Category used for rollups across every disaster type
+ALL_CATEGORIES = "all"
+PERIODS = ("all", "day", "week")
+ROLLUP_VERSION = "1"
+
+def period_bucket(period: str, date: str) -> str:
+    """Bucket key for a score date ('YYYY-MM-DD HH:MM') within a rollup period"""
+    if period == "day":
+        return date[:10]
+    if period == "week":
+        return datetime.strptime(date[:10], "%Y-%m-%d").strftime("%G-W%V")
+    return ""
+
+class LeaderboardStore:
+    """Quiz scores in SQLite (WAL mode), safe for concurrent writers.
+
+    Each thread gets its own connection; WAL lets readers run alongside a
+    writer, and every score is a single-row insert so concurrent finishers
+    never overwrite each other. Scores from the old leaderboard.json are
+    imported once on first use.
+
+    Alongside each insert, the same transaction updates per-category
+    rollups (attempts, total and best score) for all-time, per-day and
+    per-week buckets, plus a top-N table per bucket trimmed to top_n rows.
+    Dashboards read these small tables instead of scanning every score.
+    """
+
+    def __init__(self, path: str = 'leaderboard.db', legacy_json_path: Optional[str] = 'leaderboard.json',
+                 top_n: int = 10):
+        self.path = path
+        self.top_n = top_n
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._migrate()
+        if legacy_json_path:
+            self._import_legacy_json(legacy_json_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add_score(self, name: str, score: int, date: str, disaster_type: Optional[str] = None) -> int:
+        with self._connect() as conn:
+            return self._insert(conn, name, score, date, disaster_type)
+
+    def top(self, n: int = 10) -> List[Dict]:
+        rows = self._connect().execute(
+            "SELECT name, score, date, disaster_type FROM scores ORDER BY score DESC, date DESC LIMIT ?", (n,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def top_for(self, category: str = ALL_CATEGORIES, period: str = "all", bucket: str = "") -> List[Dict]:
+        """Precomputed top-N for one category and period bucket"""
+        rows = self._connect().execute(
+            "SELECT name, score, date FROM bucket_top WHERE category = ? AND period = ? AND bucket = ? "
+            "ORDER BY score DESC, date DESC", (category, period, bucket)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def category_stats(self, period: str = "all", bucket: str = "") -> List[Dict]:
+        """Attempts, average and best score per category for one period bucket"""
+        rows = self._connect().execute(
+            "SELECT category, attempts, total_score, best_score FROM score_rollups "
+            "WHERE period = ? AND bucket = ? ORDER BY category", (period, bucket)
+        ).fetchall()
+        return [{
+            "category": row["category"],
+            "attempts": row["attempts"],
+            "average": round(row["total_score"] / row["attempts"], 2),
+            "best": row["best_score"],
+        } for row in rows]
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def _insert(self, conn: sqlite3.Connection, name: str, score: int, date: str,
+                disaster_type: Optional[str]) -> int:
+        score_id = conn.execute(
+            "INSERT INTO scores (name, score, date, disaster_type) VALUES (?, ?, ?, ?)",
+            (name, score, date, disaster_type)
+        ).lastrowid
+        self._apply_rollups(conn, score_id, name, score, date, disaster_type)
+        return score_id
+
+    def _apply_rollups(self, conn: sqlite3.Connection, score_id: int, name: str, score: int, date: str,
+                       disaster_type: Optional[str]):
+        categories = [ALL_CATEGORIES] + ([disaster_type] if disaster_type else [])
+        for category in categories:
+            for period in PERIODS:
+                bucket = period_bucket(period, date)
+                conn.execute(
+                    "INSERT INTO score_rollups (category, period, bucket, attempts, total_score, best_score) "
+                    "VALUES (?, ?, ?, 1, ?, ?) "
+                    "ON CONFLICT (category, period, bucket) DO UPDATE SET "
+                    "attempts = attempts + 1, total_score = total_score + excluded.total_score, "
+                    "best_score = MAX(best_score, excluded.best_score)",
+                    (category, period, bucket, score, score)
+                )
+                conn.execute(
+                    "INSERT INTO bucket_top (category, period, bucket, score_id, name, score, date) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (category, period, bucket, score_id, name, score, date)
+                )
+                conn.execute(
+                    "DELETE FROM bucket_top WHERE category = ? AND period = ? AND bucket = ? AND score_id NOT IN ("
+                    "SELECT score_id FROM bucket_top WHERE category = ? AND period = ? AND bucket = ? "
+                    "ORDER BY score DESC, date DESC LIMIT ?)",
+                    (category, period, bucket, category, period, bucket, self.top_n)
+                )
+
+    def _migrate(self):
+        """Add columns/rollups missing from databases created by older versions"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(scores)")}
+            if "disaster_type" not in columns:
+                conn.execute("ALTER TABLE scores ADD COLUMN disaster_type TEXT")
+            version = conn.execute("SELECT value FROM meta WHERE key = 'rollup_version'").fetchone()
+            if version and version["value"] == ROLLUP_VERSION:
+                return
+            # One-time backfill: replay existing scores through the incremental path
+            conn.execute("DELETE FROM score_rollups")
+            conn.execute("DELETE FROM bucket_top")
+            for row in conn.execute("SELECT id, name, score, date, disaster_type FROM scores").fetchall():
+                self._apply_rollups(conn, row["id"], row["name"], row["score"], row["date"], row["disaster_type"])
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rollup_version', ?)", (ROLLUP_VERSION,))
+
+    def _import_legacy_json(self, json_path: str):
+        if not os.path.exists(json_path):
+            return
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE so two processes starting together import only once
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_json_imported'").fetchone():
+                return
+            try:
+                with open(json_path, 'r') as f:
+                    entries = json.load(f)
+            except json.JSONDecodeError:
+                entries = []
+            for e in entries:
+                self._insert(conn, e["name"], e["score"], e["date"], e.get("disaster_type"))
+            conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_json_imported', ?)", (json_path,))
+
+class TopScores:
+    """Process-wide top-K scores kept in a bounded min-heap.
+
+    Scores saved through add_score() are pushed straight into the heap.
+    Rows written by other processes are picked up by comparing the table's
+    max id with the last id seen and pulling only the newer rows, so a
+    render costs one indexed lookup plus O(K) to order the heap.
+    """
+
+    def __init__(self, store: LeaderboardStore, k: int = 10):
+        self.store = store
+        self.k = k
+        self._heap: List[tuple] = []
+        self._last_id = 0
+        self._pushed_ids = set()
+        self._lock = threading.RLock()
+        self.reload()
+
+    def reload(self):
+        conn = self.store._connect()
+        with self._lock:
+            max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM scores").fetchone()[0]
+            rows = conn.execute(
+                "SELECT id, name, score, date, disaster_type FROM scores ORDER BY score DESC, date DESC LIMIT ?",
+                (self.k,)
+            ).fetchall()
+            self._heap = []
+            self._pushed_ids = set()
+            for row in rows:
+                self._push(row["id"], row["name"], row["score"], row["date"], row["disaster_type"])
+                if row["id"] > max_id:
+                    # Inserted between the two queries; don't pull it again on sync
+                    self._pushed_ids.add(row["id"])
+            self._last_id = max_id
+
+    def add_score(self, name: str, score: int, date: str, disaster_type: Optional[str] = None) -> int:
+        # Insert under the lock too, so a concurrent _sync can't pull the new
+        # row before it is marked as pushed
+        with self._lock:
+            entry_id = self.store.add_score(name, score, date, disaster_type)
+            self._push(entry_id, name, score, date, disaster_type)
+            self._pushed_ids.add(entry_id)
+        return entry_id
+
+    def top(self) -> List[Dict]:
+        with self._lock:
+            self._sync()
+            ranked = sorted(self._heap, reverse=True)
+        return [{"name": name, "score": score, "date": date, "disaster_type": disaster_type}
+                for score, date, _, name, disaster_type in ranked]
+
+    def _sync(self):
+        """Pull rows written by other processes since the last sync"""
+        conn = self.store._connect()
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM scores").fetchone()[0]
+        if max_id == self._last_id:
+            return
+        if max_id < self._last_id:
+            # The table was reset or replaced underneath us
+            self.reload()
+            return
+        rows = conn.execute(
+            "SELECT id, name, score, date, disaster_type FROM scores WHERE id > ? AND id <= ?",
+            (self._last_id, max_id)
+        ).fetchall()
+        for row in rows:
+            if row["id"] not in self._pushed_ids:
+                self._push(row["id"], row["name"], row["score"], row["date"], row["disaster_type"])
+        self._pushed_ids = {i for i in self._pushed_ids if i > max_id}
+        self._last_id = max_id
+
+    def _push(self, entry_id: int, name: str, score: int, date: str, disaster_type: Optional[str]):
+        item = (score, date, entry_id, name, disaster_type)
+        if any(held[2] == entry_id for held in self._heap):
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
@@ -0,0 +1,72 @@
+import time
+from typing import Dict, Iterator, Optional
+
+import together
+from llm_client import AsyncLLMClient, COMPLETION_PARAMS, MODEL
+
+class TogetherBackend:
+    """Completion backend that calls the Together AI API through its SDK"""
+
+    def __init__(self, model: str = MODEL):
+        self.model = model
+
+    def complete(self, prompt: str) -> str:
+        response = together.Completion.create(model=self.model, prompt=prompt, **COMPLETION_PARAMS)
+        if hasattr(response, 'choices') and response.choices:
+            return response.choices[0].text
+        return ""
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        chunks = together.Completion.create(
+            model=self.model, prompt=prompt, stream=True, **COMPLETION_PARAMS
+        )
+        for chunk in chunks:
+            if hasattr(chunk, 'choices') and chunk.choices:
+                text = chunk.choices[0].text
+                if text:
+                    yield text
+
+class FakeBackend:
+    """Offline backend that replays canned answers word by word.
+
+    Useful for local development and tests without an API key: set
+    LLM_BACKEND=fake before starting the app.
+    """
+
+    DEFAULT_REPLY = "Great question! 🌟 Staying calm and having a plan keeps everyone safe. 🎒"
+
+    def __init__(self, replies: Optional[Dict[str, str]] = None, token_delay: float = 0.02):
+        self.replies = replies or {}
+        self.token_delay = token_delay
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        return self._reply_for(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        self.calls += 1
+        words = self._reply_for(prompt).split(" ")
+        for i, word in enumerate(words):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield word if i == 0 else " " + word
+
+    def _reply_for(self, prompt: str) -> str:
+        for question, reply in self.replies.items():
+            if question in prompt:
+                return reply
+        return self.DEFAULT_REPLY
+
+BACKENDS = {
+    "together": AsyncLLMClient,
+    "together-sdk": TogetherBackend,
+    "fake": FakeBackend,
+}
+
+def create_backend(name: str = "together"):
+    """Instantiate a completion backend by name"""
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend '{name}'. Choose from: {', '.join(BACKENDS)}")
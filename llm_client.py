@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import queue
+import random
+import threading
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import aiohttp
+
+TOGETHER_API_URL = "https://api.together.xyz/v1"
+MODEL = "mistralai/Mixtral-8x7B-Instruct-v0.1"
+
+# Sampling settings used for every completion request
+COMPLETION_PARAMS = {
+    "max_tokens": 200,
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "top_k": 50,
+    "repetition_penalty": 1.0,
+}
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+class LLMRequestError(Exception):
+    """Raised when a completion request fails after all retries"""
+
+class _RetryableStatus(Exception):
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+_DONE = object()
+
+class AsyncLLMClient:
+    """Process-wide completion client running on its own asyncio loop.
+
+    Streamlit runs each session's script in a plain thread, so the client
+    owns a background event loop and exposes blocking complete()/stream()
+    wrappers on top of the async API. All requests share one keep-alive
+    connection pool, a concurrency semaphore and per-request timeouts, and
+    failed attempts are retried with full-jitter exponential backoff.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 model: str = MODEL, max_concurrency: int = 8, pool_size: int = 32,
+                 timeout: float = 30.0, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_cap: float = 8.0):
+        self.base_url = (base_url or os.getenv("TOGETHER_BASE_URL", TOGETHER_API_URL)).rstrip("/")
+        self.api_key = api_key if api_key is not None else os.getenv("TOGETHER_API_KEY", "")
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retries = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._run(self._open())
+
+    async def _open(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        self._session = aiohttp.ClientSession(connector=connector, headers=headers)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _payload(self, prompt: str, stream: bool, params: Dict) -> Dict:
+        return {"model": self.model, "prompt": prompt, "stream": stream, **COMPLETION_PARAMS, **params}
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def _check_status(self, response: aiohttp.ClientResponse):
+        if response.status in RETRY_STATUSES:
+            retry_after = response.headers.get("Retry-After")
+            raise _RetryableStatus(response.status, float(retry_after) if retry_after and retry_after.isdigit() else None)
+        if response.status >= 400:
+            body = await response.text()
+            raise LLMRequestError(f"HTTP {response.status}: {body[:200]}")
+
+    async def acomplete(self, prompt: str, **params) -> str:
+        payload = self._payload(prompt, False, params)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    async with self._session.post(f"{self.base_url}/completions", json=payload,
+                                                  timeout=timeout) as response:
+                        await self._check_status(response)
+                        data = await response.json()
+                choices = data.get("choices") or []
+                return choices[0].get("text", "") if choices else ""
+            except _RetryableStatus as e:
+                last_error, retry_after = e, e.retry_after
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        raise LLMRequestError(f"Completion failed after {self.max_retries + 1} attempts: {last_error!r}")
+
+    async def astream(self, prompt: str, **params) -> AsyncIterator[str]:
+        """Yield text chunks from a server-sent-events completion stream.
+
+        Retries only happen before the first chunk; once text has been
+        yielded, a broken stream is raised to the caller.
+        """
+        payload = self._payload(prompt, True, params)
+        # The total duration of a stream is open-ended; bound the gaps between chunks instead
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            started = False
+            try:
+                async with self._semaphore:
+                    async with self._session.post(f"{self.base_url}/completions", json=payload,
+                                                  timeout=timeout) as response:
+                        await self._check_status(response)
+                        async for raw_line in response.content:
+                            line = raw_line.decode("utf-8").strip()
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                return
+                            choices = json.loads(data).get("choices") or []
+                            text = choices[0].get("text") if choices else None
+                            if text:
+                                started = True
+                                yield text
+                return
+            except _RetryableStatus as e:
+                last_error, retry_after = e, e.retry_after
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if started:
+                    raise LLMRequestError(f"Completion stream interrupted: {e!r}")
+                last_error = e
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        raise LLMRequestError(f"Completion failed after {self.max_retries + 1} attempts: {last_error!r}")
+
+    def complete(self, prompt: str, **params) -> str:
+        """Blocking wrapper for callers running in Streamlit script threads"""
+        return self._run(self.acomplete(prompt, **params))
+
+    def stream(self, prompt: str, **params) -> Iterator[str]:
+        """Blocking iterator over streamed chunks, fed from the client loop"""
+        chunks: "queue.Queue" = queue.Queue()
+
+        async def pump():
+            try:
+                async for text in self.astream(prompt, **params):
+                    chunks.put(text)
+                chunks.put(_DONE)
+            except Exception as e:
+                chunks.put(e)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop)
+        try:
+            while True:
+                item = chunks.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stop the request if the consumer goes away mid-stream
+            future.cancel()
+
+    def close(self):
+        if self._session is not None:
+            self._run(self._session.close())
+            self._session = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
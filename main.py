@@ -2,8 +2,9 @@ import os
 from dotenv import load_dotenv
 import streamlit as st
 from utils import load_css, display_card, EDUCATIONAL_IMAGES
-import together
-import time
+from assistant import (
+    HOME_QUICK_QUESTIONS, answer_quick_question, get_answer_bank, stream_bot_response
+)
 
 # Load environment variables
 load_dotenv()
@@ -12,42 +13,6 @@ load_dotenv()
 API_KEY = os.getenv("TOGETHER_API_KEY")
 os.environ["TOGETHER_API_KEY"] = API_KEY
 
-def get_bot_response(prompt: str) -> str:
-    try:
-        system_prompt = """You are a friendly and helpful educational assistant for children.
-Your responses should be:
-- Simple and easy to understand
-- Positive and encouraging
-- Brief (2-3 sentences)
-- Include emojis where appropriate
-- Educational but fun
-Focus on teaching about disasters, sustainability, and environmental topics."""
-
-        full_prompt = f"""<system>{system_prompt}</system>
-<user>{prompt}</user>
-<assistant>"""
-
-        response = together.Completion.create(
-            model="mistralai/Mixtral-8x7B-Instruct-v0.1",
-            prompt=full_prompt,
-            max_tokens=200,
-            temperature=0.7,
-            top_p=0.9,
-            top_k=50,
-            repetition_penalty=1.0
-        )
-
-        if hasattr(response, 'choices') and response.choices:
-            response_text = response.choices[0].text
-            response_text = response_text.replace('</assistant>', '').strip()
-            return response_text
-        else:
-            return "I'd be happy to help you learn about that! Could you try asking again? 🎓"
-
-    except Exception as e:
-        st.error(f"API Error: {str(e)}")
-        return "I'm excited to help! Could you please rephrase your question? 🌈"
-
 def main():
     try:
         # Configure the page
@@ -57,6 +22,9 @@ def main():
             layout="wide"
         )
 
+        # Start warming the quick-question answers in the background
+        get_answer_bank()
+
         # Custom CSS with background image
         st.markdown("""
         <style>
@@ -246,25 +214,15 @@ def main():
 
                 # Get and display assistant response
                 with st.chat_message("assistant"):
-                    with st.spinner("Thinking... 🤔"):
-                        response = get_bot_response(prompt)
-                        time.sleep(0.5)
-                        st.markdown(response)
-                        st.session_state.messages.append({"role": "assistant", "content": response})
+                    response = st.write_stream(stream_bot_response(prompt))
+                    st.session_state.messages.append({"role": "assistant", "content": response})
 
             # Quick questions
             with st.expander("Try these questions! 💡"):
-                quick_questions = {
-                    "What is sustainability? 🌱": "What is sustainability?",
-                    "How to save water? 💧": "How can I save water?",
-                    "Earthquake safety? 🏠": "What should I do during an earthquake?",
-                    "Recycling tips? ♻️": "How do I recycle properly?"
-                }
-
-                for button_text, question in quick_questions.items():
+                for button_text, question in HOME_QUICK_QUESTIONS.items():
                     if st.button(button_text):
                         st.session_state.messages.append({"role": "user", "content": question})
-                        response = get_bot_response(question)
+                        response = answer_quick_question(question)
                         st.session_state.messages.append({"role": "assistant", "content": response})
                         st.rerun()
 
@@ -1,6 +1,11 @@
 import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
+from crowd import simulate_evacuation
+from fire import SMOKE_DANGER, FireSpread
+from pathfinding import RoutePlanner, cell_mask
+from room_player import room_player
+from safety_world import RoomObject, RoomWorld, point_object, room_walls
 
 # Page configuration
 st.set_page_config(
@@ -9,17 +14,179 @@ st.set_page_config(
     layout="wide"
 )
 
-def check_collision(person_pos, zone_pos, threshold=0.5):
-    """Check if person is within threshold distance of a zone"""
-    return abs(person_pos[0] - zone_pos[0]) < threshold and abs(person_pos[1] - zone_pos[1]) < threshold
+ROOM_WIDTH = 10
+ROOM_HEIGHT = 8
+MOVE_DISTANCE = 0.5
+MOVE_ARROWS = {(0.0, MOVE_DISTANCE): "⬆️", (-MOVE_DISTANCE, 0.0): "⬅️",
+               (0.0, -MOVE_DISTANCE): "⬇️", (MOVE_DISTANCE, 0.0): "➡️"}
 
-def create_classroom_scene(person_position, safe_zones, hazards, scenario):
-    """Create a 2D classroom scene with interactive elements"""
+# Crowd mode runs in a school hall: the classroom layout scaled up
+# HALL_SCALE times, so a few thousand people have room to move
+HALL_SCALE = 3
+CROWD_SIZES = [100, 250, 500, 1000, 2000, 3000]
+CROWD_CACHE_ENTRIES = 32
+CROWD_CACHE_TTL_SECONDS = 3600
+
+# Desks for shelter, as closed outlines
+EARTHQUAKE_DESKS = [
+    ([2, 3, 3, 2, 2], [2, 2, 3, 3, 2]),
+    ([6, 7, 7, 6, 6], [2, 2, 3, 3, 2]),
+    ([4, 6, 6, 4, 4], [6, 6, 7, 7, 6])
+]
+
+# Exits and windows
+FIRE_EXITS = [
+    # Main door
+    dict(x=[4.5, 5.5], y=[0, 0], name='Main Exit'),
+    # Emergency exits
+    dict(x=[0, 0], y=[3, 4], name='Emergency Exit 1'),
+    dict(x=[10, 10], y=[3, 4], name='Emergency Exit 2')
+]
+
+# Scenario definitions
+SCENARIOS = {
+    "earthquake": {
+        "desks": EARTHQUAKE_DESKS,
+        "exits": [],
+        "safe_zones": [(2.5, 2.5), (6.5, 2.5)],  # Under desks
+        "hazards": [(8, 7), (2, 7)],  # Falling objects
+        "instructions": """
+        ### Earthquake Safety Instructions:
+        1. DROP to the ground
+        2. COVER under a sturdy desk
+        3. HOLD ON until shaking stops
+        4. Stay away from windows and tall furniture
+        """
+    },
+    "fire": {
+        "desks": [],
+        "exits": FIRE_EXITS,
+        "safe_zones": [(5, 0), (0, 3.5), (10, 3.5)],  # Exits
+        "hazards": [(7, 7), (3, 6), (8, 3)],  # Fire spots
+        "instructions": """
+        ### Fire Safety Instructions:
+        1. Stay low to avoid smoke
+        2. Use nearest exit
+        3. Don't use elevators
+        4. Meet at assembly point
+        """
+    },
+    "tornado": {
+        "desks": EARTHQUAKE_DESKS,
+        "exits": [],
+        "safe_zones": [(2.5, 2.5), (6.5, 2.5)],  # Interior rooms
+        "hazards": [(0, 3.5), (10, 3.5)],  # Windows
+        "instructions": """
+        ### Tornado Safety Instructions:
+        1. Go to lowest floor
+        2. Stay away from windows
+        3. Get under sturdy furniture
+        4. Cover your head
+        """
+    }
+}
+
+@st.cache_resource
+def get_world(scenario, scale=1):
+    """Spatial index of one scenario's walls, desks, exits, hazards and safe zones,
+    with every coordinate multiplied by scale"""
+    config = SCENARIOS[scenario]
+    doors = [dict(door, x=[v * scale for v in door["x"]], y=[v * scale for v in door["y"]])
+             for door in config["exits"]]
+    objects = room_walls(ROOM_WIDTH * scale, ROOM_HEIGHT * scale, doors)
+    objects += [RoomObject("desk", f"Desk {i+1}", min(x) * scale, min(y) * scale, max(x) * scale, max(y) * scale)
+                for i, (x, y) in enumerate(config["desks"])]
+    objects += [RoomObject("exit", door["name"], min(door["x"]), min(door["y"]), max(door["x"]), max(door["y"]))
+                for door in doors]
+    objects += [point_object("hazard", "Hazard", (x * scale, y * scale), 0.5 * scale) for x, y in config["hazards"]]
+    objects += [point_object("safe", "Safe Zone", (x * scale, y * scale), 0.5 * scale) for x, y in config["safe_zones"]]
+    return RoomWorld((-1, -1, ROOM_WIDTH * scale + 1, ROOM_HEIGHT * scale + 1), objects)
+
+@st.cache_resource
+def get_route_planner(scenario, scale=1):
+    """Distance field to the scenario's safe zones; hints are one lookup per move"""
+    return RoutePlanner(get_world(scenario, scale), step=MOVE_DISTANCE)
+
+def start_fire(world):
+    """Fresh fire for the fire scenario: it starts at the hazard spots and can
+    only burn inside the room, while smoke escapes through the doors"""
+    xs = world.x_min + np.arange(world.cols) * world.cell_size
+    ys = world.y_min + np.arange(world.rows) * world.cell_size
+    room = ((ys > 0) & (ys < ROOM_HEIGHT))[:, None] & ((xs > 0) & (xs < ROOM_WIDTH))[None, :]
+    return FireSpread(world, cell_mask(world, "hazard"), fuel=room)
+
+@st.cache_data(max_entries=CROWD_CACHE_ENTRIES, ttl=CROWD_CACHE_TTL_SECONDS,
+               show_spinner="Evacuating the hall...")
+def crowd_evacuation(scenario, agents, seed):
+    """Social force evacuation of the school hall for one crowd size and seed"""
+    return simulate_evacuation(get_route_planner(scenario, HALL_SCALE), agents, seed)
+
+def crowd_figures(scenario, result):
+    """Density heatmap of the hall and the evacuation curve for one crowd run"""
+    x_centres = (result["x_edges"][:-1] + result["x_edges"][1:]) / 2
+    y_centres = (result["y_edges"][:-1] + result["y_edges"][1:]) / 2
+    heatmap = go.Figure(go.Heatmap(
+        x=x_centres, y=y_centres, z=result["peak_density"],
+        colorscale="YlOrRd", zmin=0, colorbar=dict(title="people/m²")
+    ))
+    width, height = ROOM_WIDTH * HALL_SCALE, ROOM_HEIGHT * HALL_SCALE
+    heatmap.add_trace(go.Scatter(
+        x=[0, width, width, 0, 0], y=[0, 0, height, height, 0],
+        mode='lines', name='Walls', line=dict(color='black', width=2)
+    ))
+    for door in SCENARIOS[scenario]["exits"]:
+        heatmap.add_trace(go.Scatter(
+            x=[v * HALL_SCALE for v in door["x"]], y=[v * HALL_SCALE for v in door["y"]],
+            mode='lines', name=door["name"], line=dict(color='rgb(0,255,0)', width=5)
+        ))
+    heatmap.update_layout(
+        title="Peak crowd density",
+        xaxis=dict(title="m", showgrid=False),
+        yaxis=dict(title="m", showgrid=False, scaleanchor="x"),
+        height=500, showlegend=False, plot_bgcolor='white'
+    )
+
+    curve = go.Figure(go.Scatter(
+        x=result["times"], y=result["timeline"], mode='lines',
+        line=dict(color='rgb(0,170,0)', width=3), name='Safe'
+    ))
+    curve.update_layout(
+        title="People in safety over time",
+        xaxis=dict(title="Seconds"), yaxis=dict(title="People"),
+        height=350
+    )
+    return heatmap, curve
+
+def create_classroom_scene(person_position, scenario, world, route=None, fire=None, placeholders=False):
+    """Create a 2D classroom scene with interactive elements.
+
+    With placeholders, the player and route traces are left empty for the
+    in-browser player to fill, so the figure doesn't change as you move.
+    """
     fig = go.Figure()
 
+    # Spreading fire and smoke, under everything else: grey smoke gets
+    # darker as it thickens, burning cells are orange
+    if fire is not None:
+        layer = np.where(fire.burning, 2.0, fire.smoke)
+        layer[layer <= 0.05] = np.nan
+        fig.add_trace(go.Heatmap(
+            x=world.x_min + np.arange(world.cols) * world.cell_size,
+            y=world.y_min + np.arange(world.rows) * world.cell_size,
+            z=layer,
+            zmin=0, zmax=2,
+            colorscale=[[0.0, 'rgba(160,160,160,0.2)'], [0.5, 'rgba(60,60,60,0.7)'],
+                        [0.5, 'rgba(255,120,0,0.8)'], [1.0, 'rgba(255,60,0,0.9)']],
+            showscale=False,
+            hoverinfo='skip',
+            name='Fire and Smoke'
+        ))
+    safe_zones = SCENARIOS[scenario]["safe_zones"]
+    hazards = SCENARIOS[scenario]["hazards"]
+
     # Room boundaries
-    room_width = 10
-    room_height = 8
+    room_width = ROOM_WIDTH
+    room_height = ROOM_HEIGHT
 
     # Draw room walls
     fig.add_trace(go.Scatter(
@@ -31,14 +198,9 @@ def create_classroom_scene(person_position, safe_zones, hazards, scenario):
     ))
 
     # Add furniture based on scenario
-    if scenario in ['earthquake', 'tornado']:
+    if SCENARIOS[scenario]["desks"]:
         # Desks for shelter
-        desks = [
-            ([2, 3, 3, 2, 2], [2, 2, 3, 3, 2]),
-            ([6, 7, 7, 6, 6], [2, 2, 3, 3, 2]),
-            ([4, 6, 6, 4, 4], [6, 6, 7, 7, 6])
-        ]
-        for i, (x, y) in enumerate(desks):
+        for i, (x, y) in enumerate(SCENARIOS[scenario]["desks"]):
             fig.add_trace(go.Scatter(
                 x=x, y=y,
                 mode='lines',
@@ -48,16 +210,8 @@ def create_classroom_scene(person_position, safe_zones, hazards, scenario):
                 line=dict(color='rgb(139,69,19)')
             ))
 
-    elif scenario == 'fire':
-        # Exits and windows
-        exits = [
-            # Main door
-            dict(x=[4.5, 5.5], y=[0, 0], name='Main Exit'),
-            # Emergency exits
-            dict(x=[0, 0], y=[3, 4], name='Emergency Exit 1'),
-            dict(x=[10, 10], y=[3, 4], name='Emergency Exit 2')
-        ]
-        for exit_door in exits:
+    if SCENARIOS[scenario]["exits"]:
+        for exit_door in SCENARIOS[scenario]["exits"]:
             fig.add_trace(go.Scatter(
                 x=exit_door['x'],
                 y=exit_door['y'],
@@ -66,15 +220,25 @@ def create_classroom_scene(person_position, safe_zones, hazards, scenario):
                 line=dict(color='rgb(0,255,0)', width=5)
             ))
 
-    # Add person with current status color
-    person_in_hazard = any(check_collision(person_position, hazard) for hazard in hazards)
-    person_in_safe = any(check_collision(person_position, safe) for safe in safe_zones)
+    # Shortest safe route overlay, drawn under the player
+    if route is not None:
+        fig.add_trace(go.Scatter(
+            x=[] if placeholders else [point[0] for point in route],
+            y=[] if placeholders else [point[1] for point in route],
+            mode='lines',
+            name='Safest Route',
+            line=dict(color='rgb(0,170,0)', width=3, dash='dot')
+        ))
+
+    # Add person with current status color: one spatial-index lookup each
+    person_in_hazard = world.hits(person_position, "hazard") or (fire is not None and fire.in_hazard(person_position))
+    person_in_safe = world.hits(person_position, "safe")
     
     person_color = 'rgb(255,0,0)' if person_in_hazard else 'rgb(0,255,0)' if person_in_safe else 'rgb(0,0,255)'
     
     fig.add_trace(go.Scatter(
-        x=[person_position[0]],
-        y=[person_position[1]],
+        x=[] if placeholders else [person_position[0]],
+        y=[] if placeholders else [person_position[1]],
         mode='markers+text',
         name='You',
         marker=dict(size=20, symbol='circle', color=person_color),
@@ -134,47 +298,10 @@ def main():
     st.title("🏃 2D Safety Simulator")
     st.markdown("### Learn how to stay safe in different emergency situations!")
 
-    # Scenario definitions
-    scenarios = {
-        "earthquake": {
-            "safe_zones": [(2.5, 2.5), (6.5, 2.5)],  # Under desks
-            "hazards": [(8, 7), (2, 7)],  # Falling objects
-            "instructions": """
-            ### Earthquake Safety Instructions:
-            1. DROP to the ground
-            2. COVER under a sturdy desk
-            3. HOLD ON until shaking stops
-            4. Stay away from windows and tall furniture
-            """
-        },
-        "fire": {
-            "safe_zones": [(5, 0), (0, 3.5), (10, 3.5)],  # Exits
-            "hazards": [(7, 7), (3, 6), (8, 3)],  # Fire spots
-            "instructions": """
-            ### Fire Safety Instructions:
-            1. Stay low to avoid smoke
-            2. Use nearest exit
-            3. Don't use elevators
-            4. Meet at assembly point
-            """
-        },
-        "tornado": {
-            "safe_zones": [(2.5, 2.5), (6.5, 2.5)],  # Interior rooms
-            "hazards": [(0, 3.5), (10, 3.5)],  # Windows
-            "instructions": """
-            ### Tornado Safety Instructions:
-            1. Go to lowest floor
-            2. Stay away from windows
-            3. Get under sturdy furniture
-            4. Cover your head
-            """
-        }
-    }
-
     # Select scenario
     scenario = st.selectbox(
         "Choose a Scenario:",
-        list(scenarios.keys())
+        list(SCENARIOS.keys())
     )
 
     # Initialize session state
@@ -182,39 +309,110 @@ def main():
         st.session_state.person_position = [5, 4]
     if 'game_status' not in st.session_state:
         st.session_state.game_status = "active"
+    # Bumped whenever the player is put back, so the in-browser player follows
+    if st.session_state.get('scenario') != scenario:
+        st.session_state.scenario = scenario
+        st.session_state.epoch = st.session_state.get('epoch', 0) + 1
+
+    world = get_world(scenario)
+    planner = get_route_planner(scenario)
+
+    # The fire scenario's fire spreads a step every time you move
+    fire = None
+    if scenario == "fire":
+        if st.session_state.get('fire') is None:
+            st.session_state.fire = start_fire(world)
+        fire = st.session_state.fire
+
+    # Moves made in the browser since the last rerun, reported in one go
+    report = st.session_state.get('room_player')
+    if report and report["seq"] != st.session_state.get('room_player_seq'):
+        st.session_state.room_player_seq = report["seq"]
+        if report.get("plotly_missing"):
+            # The browser couldn't load Plotly: back to the buttons
+            st.session_state.instant = False
+            st.session_state.instant_failed = True
+        elif "position" in report:
+            st.session_state.person_position = list(report["position"])
+            if fire is not None:
+                for _ in range(report["moves"]):
+                    fire.step()
+
+    if fire is not None:
+        # Route around wherever the fire and smoke are now; the field only
+        # changes when the fire steps, so reruns in between reuse it
+        fire_key = (id(fire), fire.steps)
+        cached = st.session_state.get('fire_planner')
+        if cached is None or cached[0] != fire_key:
+            cached = (fire_key, RoutePlanner(world, step=MOVE_DISTANCE, hazard=cell_mask(world, "hazard") | fire.hazard))
+            st.session_state.fire_planner = cached
+        planner = cached[1]
+    else:
+        st.session_state.fire = None
+        st.session_state.fire_planner = None
+
+    show_route = st.toggle("🧭 Show the shortest safe route")
+    if 'instant' not in st.session_state:
+        st.session_state.instant = True
+    instant = st.toggle("⚡ Instant movement (arrow keys move you in the browser)", key='instant')
+    if st.session_state.get('instant_failed') and not instant:
+        st.info("Instant movement couldn't start in this browser, so the arrow buttons are back.")
 
     # Movement controls and display
     col1, col2 = st.columns([3, 1])
     
     with col1:
+        route = planner.route(tuple(st.session_state.person_position)) if show_route else None
         fig, in_hazard, in_safe = create_classroom_scene(
             st.session_state.person_position,
-            scenarios[scenario]["safe_zones"],
-            scenarios[scenario]["hazards"],
-            scenario
+            scenario,
+            world,
+            ([] if instant else route) if show_route else None,
+            fire,
+            placeholders=instant
         )
-        st.plotly_chart(fig, use_container_width=True)
+        if instant:
+            hazard = cell_mask(world, "hazard")
+            if fire is not None:
+                hazard = hazard | fire.hazard
+            room_player(fig, world, st.session_state.person_position, hazard, cell_mask(world, "safe"),
+                        planner.best_move, planner.moves, st.session_state.epoch, route, key='room_player')
+        else:
+            st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         st.markdown("### Controls")
-        move_distance = 0.5
-        
-        # Movement buttons with keyboard-like layout
-        _, up, _ = st.columns(3)
-        left, down, right = st.columns(3)
-        
-        with up:
-            if st.button("⬆️"):
-                st.session_state.person_position[1] += move_distance
-        with left:
-            if st.button("⬅️"):
-                st.session_state.person_position[0] -= move_distance
-        with down:
-            if st.button("⬇️"):
-                st.session_state.person_position[1] -= move_distance
-        with right:
-            if st.button("➡️"):
-                st.session_state.person_position[0] += move_distance
+        move_distance = MOVE_DISTANCE
+
+        step = None
+        if instant:
+            st.caption("Click the room, then use the arrow keys or the buttons under it.")
+        else:
+            # Movement buttons with keyboard-like layout
+            _, up, _ = st.columns(3)
+            left, down, right = st.columns(3)
+
+            with up:
+                if st.button("⬆️"):
+                    step = (0, move_distance)
+            with left:
+                if st.button("⬅️"):
+                    step = (-move_distance, 0)
+            with down:
+                if st.button("⬇️"):
+                    step = (0, -move_distance)
+            with right:
+                if st.button("➡️"):
+                    step = (move_distance, 0)
+        if step is not None:
+            position = st.session_state.person_position
+            target = (position[0] + step[0], position[1] + step[1])
+            if world.is_blocked(target):
+                st.info("🧱 A wall is in the way!")
+            else:
+                st.session_state.person_position = list(target)
+                if fire is not None:
+                    fire.step()
 
         # Status feedback
         if in_hazard:
@@ -224,13 +422,51 @@ def main():
         else:
             st.warning("🎯 Find a safe position!")
 
+        # Hint: the move that heads for safety, straight from the distance field
+        position = tuple(st.session_state.person_position)
+        hint = planner.hint(position)
+        if hint is not None:
+            st.markdown(f"**💡 Hint:** try {MOVE_ARROWS[hint]} "
+                        f"(about {planner.distance(position):.1f} m to safety)")
+
+        # Can the nearest way out be seen from here?
+        nearest_safe = world.nearest(tuple(st.session_state.person_position), "safe")
+        if nearest_safe and not in_safe and world.line_of_sight(st.session_state.person_position, nearest_safe.center):
+            st.caption("👀 You can see a safe spot from here.")
+
+        if fire is not None:
+            cell_area = world.cell_size ** 2
+            st.caption(f"🔥 {fire.burning.sum() * cell_area:.1f} m² burning, "
+                       f"{(fire.smoke > SMOKE_DANGER).sum() * cell_area:.1f} m² of thick smoke")
+
         # Display instructions
-        st.markdown(scenarios[scenario]["instructions"])
+        st.markdown(SCENARIOS[scenario]["instructions"])
+
+    # Crowd mode: the whole school at once
+    with st.expander("👥 Crowd evacuation"):
+        st.markdown(f"Everyone in a {ROOM_WIDTH * HALL_SCALE} m × {ROOM_HEIGHT * HALL_SCALE} m "
+                    f"hall heads for safety at once, pushing past each other in the doorways.")
+        agents = st.select_slider("People", options=CROWD_SIZES, value=500)
+        crowd_seed = st.number_input("Crowd seed", min_value=0, value=0, step=1)
+        if st.button("Run evacuation"):
+            result = crowd_evacuation(scenario, agents, int(crowd_seed))
+            stats = result["stats"]
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Reached safety", f"{stats['evacuated']:.0%}")
+            c2.metric("Half safe after", f"{stats['p50_seconds']:.0f} s")
+            c3.metric("90% safe after", f"{stats['p90_seconds']:.0f} s")
+            c4.metric("Everyone safe after", f"{stats['p100_seconds']:.0f} s")
+            heatmap, curve = crowd_figures(scenario, result)
+            st.plotly_chart(heatmap, use_container_width=True)
+            st.plotly_chart(curve, use_container_width=True)
+            st.caption(f"{result['agent_steps_per_second']:,.0f} agent updates per second")
 
     # Reset button
     if st.button("Reset Position"):
         st.session_state.person_position = [5, 4]
         st.session_state.game_status = "active"
+        st.session_state.fire = None
+        st.session_state.epoch += 1
         st.experimental_rerun()
 
 if __name__ == "__main__":
@@ -1,8 +1,7 @@
 import streamlit as st
-import json
 import random
 from datetime import datetime
-import pandas as pd
+from leaderboard_store import ALL_CATEGORIES, LeaderboardStore, TopScores, period_bucket
 
 # Page configuration
 st.set_page_config(
@@ -217,34 +216,75 @@ quiz_questions = {
     ]
 }
 
+@st.cache_resource
+def get_leaderboard_store():
+    return LeaderboardStore('leaderboard.db', legacy_json_path='leaderboard.json')
+
+@st.cache_resource
+def get_top_scores():
+    """Top-10 heap shared by all sessions, updated as scores are saved"""
+    return TopScores(get_leaderboard_store(), k=10)
+
 def load_leaderboard():
-    try:
-        with open('leaderboard.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
+    """Top scores, highest first, from the in-memory top-K"""
+    return get_top_scores().top()
 
-def save_leaderboard(leaderboard):
-    with open('leaderboard.json', 'w') as f:
-        json.dump(leaderboard, f)
+def save_leaderboard(entry):
+    """Append one score atomically and push it into the top-K"""
+    get_top_scores().add_score(entry["name"], entry["score"], entry["date"], entry.get("disaster_type"))
 
 def display_leaderboard(leaderboard):
     if leaderboard:
-        df = pd.DataFrame(leaderboard)
-        df = df.sort_values('score', ascending=False).head(10)
         st.markdown("### 🏆 Top 10 Leaderboard")
         st.dataframe(
-            df,
+            leaderboard,
             column_config={
                 "name": "Player",
                 "score": "Score",
-                "date": "Date"
+                "date": "Date",
+                "disaster_type": "Quiz"
             },
             use_container_width=True
         )
     else:
         st.info("No scores yet. Be the first to take the quiz!")
 
+def display_class_dashboard():
+    """Per-category and per-period results read from the precomputed rollups"""
+    store = get_leaderboard_store()
+    with st.expander("📊 Class Dashboard"):
+        col1, col2 = st.columns(2)
+        with col1:
+            category = st.selectbox("Quiz", [ALL_CATEGORIES] + list(quiz_questions.keys()), key="dash_category")
+        with col2:
+            period = st.radio("Time window", ["all", "day", "week"], horizontal=True, key="dash_period",
+                              format_func={"all": "All time", "day": "Today", "week": "This week"}.get)
+        bucket = period_bucket(period, datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+        st.markdown("#### Average score per quiz")
+        stats = store.category_stats(period, bucket)
+        if stats:
+            st.dataframe(
+                stats,
+                column_config={
+                    "category": "Quiz",
+                    "attempts": "Attempts",
+                    "average": "Average Score",
+                    "best": "Best Score"
+                },
+                use_container_width=True
+            )
+        else:
+            st.info("No attempts in this time window yet.")
+
+        st.markdown("#### Top scores")
+        top = store.top_for(category, period, bucket)
+        if top:
+            st.dataframe(top, column_config={"name": "Player", "score": "Score", "date": "Date"},
+                         use_container_width=True)
+        else:
+            st.info("No scores for this quiz in this time window yet.")
+
 def main():
     st.title("📝 Safety Knowledge Test")
     st.markdown("### Test your knowledge about disaster safety!")
@@ -272,6 +312,7 @@ def main():
         )
         if st.button("Start Quiz"):
             st.session_state.questions = quiz_questions[disaster_type]
+            st.session_state.disaster_type = disaster_type
             random.shuffle(st.session_state.questions)
             st.session_state.quiz_started = True
             st.session_state.selected_answer = None
@@ -325,18 +366,18 @@ def main():
         # Save score to leaderboard
         name = st.text_input("Enter your name to save your score:")
         if name and st.button("Save Score to Leaderboard"):
-            leaderboard = load_leaderboard()
-            leaderboard.append({
+            save_leaderboard({
                 "name": name,
                 "score": final_score,
-                "date": datetime.now().strftime("%Y-%m-%d %H:%M")
+                "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "disaster_type": st.session_state.get("disaster_type")
             })
-            save_leaderboard(leaderboard)
             st.success("Score saved!")
 
         # Display leaderboard
         leaderboard = load_leaderboard()
         display_leaderboard(leaderboard)
+        display_class_dashboard()
 
         # Restart quiz button
         if st.button("Take Another Quiz"):
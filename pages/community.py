@@ -1,5 +1,8 @@
+import html
 import streamlit as st
-import datetime
+from counters import WriteBehindCounter
+from forum_store import ForumStore
+from fragment_cache import FragmentCache
 
 # Page configuration
 st.set_page_config(
@@ -8,9 +11,27 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state for posts if not exists
-if 'forum_posts' not in st.session_state:
-    st.session_state.forum_posts = []
+POSTS_PER_PAGE = 10
+CATEGORIES = ["Disaster Experience", "Safety Tips", "Resources", "Recovery Story"]
+
+@st.cache_resource
+def get_forum_store():
+    """Forum storage shared by every session"""
+    return ForumStore('forum.db')
+
+@st.cache_resource
+def get_like_counter():
+    """Likes are counted in memory and written to the forum store in batches"""
+    return WriteBehindCounter(get_forum_store().apply_like_deltas, interval_seconds=2.0)
+
+@st.cache_resource
+def get_fragment_cache():
+    """Rendered post/comment HTML shared by every session"""
+    return FragmentCache(max_entries=2000)
+
+store = get_forum_store()
+likes = get_like_counter()
+fragments = get_fragment_cache()
 
 # Custom CSS to enforce white text visibility
 st.markdown(f"""
@@ -79,6 +100,80 @@ st.markdown("""
 ### **Share your experiences, ask questions, and connect with others in our disaster preparedness community.**  
 """)
 
+def post_card_html(post, like_count):
+    """Escaped HTML for a post card"""
+    return f"""
+        <div class="forum-post">
+            <div class="post-header">
+                ✍️ <b>Posted by {html.escape(post['author'])} • {post['timestamp'].strftime('%Y-%m-%d %H:%M')}</b>
+                • <a href="?post={post['id']}" target="_self">🔗 #{post['id']}</a>
+            </div>
+            <h3><b>{html.escape(post['title'])}</b></h3>
+            <span class="category-tag">{html.escape(post['category'])}</span>
+            <div class="post-content">{html.escape(post['content'])}</div>
+            <div class="post-footer">
+                ❤️ {like_count} Likes • 💬 {len(post['comments'])} Comments
+            </div>
+        </div>
+        """
+
+def comment_thread_html(comments):
+    """Escaped HTML for every comment on a post, as one block"""
+    return "".join(f"""
+        <div id="comment-{comment['id']}" style='padding: 10px; border-left: 3px solid #3498db; margin: 5px 0; color: black; font-weight: bold;'>
+            <small>{html.escape(comment['author'])} • {comment['timestamp'].strftime('%Y-%m-%d %H:%M')}</small>
+            <p>{html.escape(comment['content'])}</p>
+        </div>
+        """ for comment in comments)
+
+def search_result_html(post):
+    """Escaped HTML for a compact search result card"""
+    return f"""
+            <div class="forum-post">
+                <div class="post-header">📌 <b>Posted by {html.escape(post['author'])}</b> • <a href="?post={post['id']}" target="_self">🔗 #{post['id']}</a></div>
+                <h3><b>{html.escape(post['title'])}</b></h3>
+                <span class="category-tag">{html.escape(post['category'])}</span>
+                <div class="post-content">{html.escape(post['content'])}</div>
+            </div>
+            """
+
+def render_post(post, pending_likes, section="browse"):
+    """Post card with like button and comments; widget keys use the post's stable id.
+    pending_likes are the unflushed likes read along with the post"""
+    post_id = post['id']
+    like_count = post['likes'] + pending_likes.get(post_id, 0)
+    comment_version = (len(post['comments']), post['comments'][-1]['id'] if post['comments'] else 0)
+    with st.container():
+        # Cached fragments are re-rendered only when this post's likes or comments change
+        st.markdown(
+            fragments.get(("card", post_id), (like_count, comment_version), lambda: post_card_html(post, like_count)),
+            unsafe_allow_html=True
+        )
+        
+        # Like button and comments
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            if st.button("❤️ Like", key=f"{section}_like_{post_id}"):
+                likes.increment(post_id)
+                st.rerun()
+        
+        # Comments section
+        with st.expander("💬 **VIEW & ADD COMMENTS**", expanded=section == "linked"):
+            if post['comments']:
+                st.markdown(
+                    fragments.get(("comments", post_id), comment_version,
+                                  lambda: comment_thread_html(post['comments'])),
+                    unsafe_allow_html=True
+                )
+            
+            # Add new comment
+            new_comment = st.text_area("💭 **Write a comment**", key=f"{section}_comment_{post_id}")
+            if st.button("➕ **Submit Comment**", key=f"{section}_post_comment_{post_id}"):
+                if new_comment:
+                    store.add_comment(post_id, new_comment)
+                    st.success("✅ **Comment added!**")
+                    st.rerun()
+
 # Create tabs with improved white text visibility
 tab1, tab2, tab3 = st.tabs([
     "📢 **BROWSE POSTS**",  
@@ -87,61 +182,57 @@ tab1, tab2, tab3 = st.tabs([
 ])
 
 with tab1:
-    if not st.session_state.forum_posts:
+    # Deep link: ?post=<id> pins that post above the list
+    linked_id = st.query_params.get("post")
+    if linked_id:
+        linked_post, pending_likes = likes.read(
+            lambda: store.get_post(int(linked_id)) if linked_id.isdigit() else None
+        )
+        if linked_post:
+            st.markdown("### 🔗 **LINKED POST**")
+            render_post(linked_post, pending_likes, section="linked")
+        else:
+            st.warning("⚠️ **That post could not be found.**")
+        if st.button("📢 **Show all posts**", key="clear_linked_post"):
+            del st.query_params["post"]
+            st.rerun()
+
+    category_counts = store.category_counts()
+    if not category_counts:
         st.info("🚀 **No posts yet! Be the first to share your experience.**")
     else:
-        # **Filter section with white text**
+        # **Filter section with white text**, with live post counts per category
+        option_counts = {"All Categories": sum(category_counts.values()), **category_counts}
         category_filter = st.selectbox(
             "📂 **FILTER BY CATEGORY**",
-            ["All Categories", "Disaster Experience", "Safety Tips", "Resources", "Recovery Story"]
+            ["All Categories"] + CATEGORIES,
+            format_func=lambda option: f"{option} ({option_counts.get(option, 0)})"
+        )
+        category = None if category_filter == "All Categories" else category_filter
+
+        # One cursor stack per category: the before_id of every page visited so far
+        cursors = st.session_state.setdefault("browse_cursors", {}).setdefault(category_filter, [None])
+        posts, pending_likes = likes.read(
+            lambda: store.list_posts(category, before_id=cursors[-1], limit=POSTS_PER_PAGE + 1)
         )
+        has_older = len(posts) > POSTS_PER_PAGE
+        posts = posts[:POSTS_PER_PAGE]
         
-        # **Display posts based on filtering**
-        for post in st.session_state.forum_posts:
-            if category_filter == "All Categories" or post["category"] == category_filter:
-                with st.container():
-                    st.markdown(f"""
-                    <div class="forum-post">
-                        <div class="post-header">
-                            ✍️ <b>Posted by {post['author']} • {post['timestamp'].strftime('%Y-%m-%d %H:%M')}</b>
-                        </div>
-                        <h3><b>{post['title']}</b></h3>
-                        <span class="category-tag">{post['category']}</span>
-                        <div class="post-content">{post['content']}</div>
-                        <div class="post-footer">
-                            ❤️ {post['likes']} Likes • 💬 {len(post['comments'])} Comments
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Like button and comments
-                    col1, col2 = st.columns([1, 4])
-                    with col1:
-                        if st.button("❤️ Like", key=f"like_{post['timestamp']}"):
-                            post['likes'] += 1
-                            st.rerun()
-                    
-                    # Comments section
-                    with st.expander("💬 **VIEW & ADD COMMENTS**"):
-                        for comment in post['comments']:
-                            st.markdown(f"""
-                            <div style='padding: 10px; border-left: 3px solid #3498db; margin: 5px 0; color: black; font-weight: bold;'>
-                                <small>{comment['author']} • {comment['timestamp'].strftime('%Y-%m-%d %H:%M')}</small>
-                                <p>{comment['content']}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        # Add new comment
-                        new_comment = st.text_area("💭 **Write a comment**", key=f"comment_{post['timestamp']}")
-                        if st.button("➕ **Submit Comment**", key=f"post_comment_{post['timestamp']}"):
-                            if new_comment:
-                                post['comments'].append({
-                                    'author': 'Anonymous',
-                                    'content': new_comment,
-                                    'timestamp': datetime.datetime.now()
-                                })
-                                st.success("✅ **Comment added!**")
-                                st.rerun()
+        # **Display one page of posts based on filtering**
+        for post in posts:
+            render_post(post, pending_likes)
+
+        newer_col, page_col, older_col = st.columns([1, 2, 1])
+        with newer_col:
+            if len(cursors) > 1 and st.button("⬅️ **Newer posts**", key="newer_posts"):
+                cursors.pop()
+                st.rerun()
+        with page_col:
+            st.markdown(f"**📄 Page {len(cursors)}**")
+        with older_col:
+            if has_older and st.button("**Older posts** ➡️", key="older_posts"):
+                cursors.append(posts[-1]['id'])
+                st.rerun()
 
 with tab2:
     st.markdown("## **📝 SHARE YOUR STORY**")
@@ -149,22 +240,13 @@ with tab2:
         title = st.text_input("📝 **Title of Your Post**")
         category = st.selectbox(
             "📌 **Choose a Category**",
-            ["Disaster Experience", "Safety Tips", "Resources", "Recovery Story"]
+            CATEGORIES
         )
         content = st.text_area("🖊️ **Describe Your Experience**")
         
         if st.form_submit_button("🚀 **Post Now**"):
             if title and content:
-                new_post = {
-                    "title": title,
-                    "category": category,
-                    "content": content,
-                    "author": "Anonymous",
-                    "timestamp": datetime.datetime.now(),
-                    "likes": 0,
-                    "comments": []
-                }
-                st.session_state.forum_posts.insert(0, new_post)
+                store.create_post(title, category, content)
                 st.success("✅ **Post created successfully!**")
                 st.rerun()
             else:
@@ -174,18 +256,25 @@ with tab3:
     st.markdown("## 🔍 **SEARCH FORUM POSTS**")
     search_term = st.text_input("🔎 **Enter a Keyword to Search**")
     if search_term:
-        found_posts = False
-        for post in st.session_state.forum_posts:
-            if search_term.lower() in post['title'].lower() or search_term.lower() in post['content'].lower():
-                found_posts = True
-                st.markdown(f"""
-                <div class="forum-post">
-                    <div class="post-header">📌 <b>Posted by {post['author']}</b></div>
-                    <h3><b>{post['title']}</b></h3>
-                    <span class="category-tag">{post['category']}</span>
-                    <div class="post-content">{post['content']}</div>
-                </div>
-                """, unsafe_allow_html=True)
+        results, total_matches = store.search_posts(search_term, page_size=POSTS_PER_PAGE)
+        if total_matches > POSTS_PER_PAGE:
+            total_pages = -(-total_matches // POSTS_PER_PAGE)
+            search_page = st.number_input("📄 **RESULTS PAGE**", min_value=1, max_value=total_pages,
+                                          value=1, step=1, key="search_page")
+            results, _ = store.search_posts(search_term, search_page, POSTS_PER_PAGE)
+        if results:
+            st.markdown(f"**{total_matches} matching posts**")
+
+        for post in results:
+            # Titles and content never change, so one version per post
+            st.markdown(fragments.get(("search", post['id']), 0, lambda: search_result_html(post)),
+                        unsafe_allow_html=True)
         
-        if not found_posts:
+        if not results:
             st.info("⚠️ **No matching posts found. Try a different keyword!**")
+
+# How often rendered posts were reused instead of rebuilt, across every session
+cache_stats = fragments.stats()
+st.caption(f"⚡ {cache_stats['hit_rate']:.0%} of post renders came from the cache "
+           f"({cache_stats['hits']:,} reused, {cache_stats['misses']:,} rendered, "
+           f"{cache_stats['entries']:,} kept).")
@@ -1,9 +1,379 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from utils import load_css, display_card
+from seismic import DEFAULT_STATION_DISTANCES_KM, synthetic_seismograms
+from tsunami import (SOURCE_AMPLITUDE, PropagationRun, load_bathymetry, simulate_propagation,
+                     synthetic_bathymetry, tsunami_characteristics)
+from animation import AdaptiveFrames
+from ensemble import ENVELOPE_RATE_HZ, exceedance, run_ensemble, spread_thresholds
+from hurricane import M_TO_FEET, MPS_TO_MPH, TRACK_HOURS, simulate_hurricane
+
+# Memoized results: every slider combination is computed once per process and
+# shared by all sessions; old combinations age out after CACHE_TTL_SECONDS.
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 3600
+
+# Animation: about this many frames per tsunami run, each at most
+# ANIMATION_MAX_CELLS cells, with the last REPLAY_FRAMES kept for replay;
+# seismograms play back in real time, one frame per SEISMOGRAM_FRAME_SECONDS
+ANIMATION_FRAMES = 120
+ANIMATION_MAX_CELLS = 6000
+REPLAY_FRAMES = 30
+SEISMOGRAM_FRAME_SECONDS = 0.1
+
+# Ensemble mode: one worker process per core, shared by every session
+ENSEMBLE_WORKERS = os.cpu_count() or 1
+# Shaking spans orders of magnitude across the magnitude slider, so its
+# thresholds come from each ensemble's own spread
+QUAKE_THRESHOLD_COUNT = 41
+TSUNAMI_THRESHOLDS_M = np.linspace(0, 15, 31)
+
+@st.cache_resource
+def get_process_pool():
+    """Worker processes for ensemble runs"""
+    # forkserver: never fork the threaded Streamlit server itself; Windows
+    # only has spawn, which doesn't fork either
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=ENSEMBLE_WORKERS, mp_context=multiprocessing.get_context(method))
+
+def quantize(value, step):
+    """Snap a widget value to its slider step so equal settings share a cache key"""
+    return round(round(value / step) * step, 6)
+
+def earthquake_record(magnitude, duration, seed):
+    """100 Hz seismograms for stations at increasing distances"""
+    return synthetic_seismograms(magnitude, duration, DEFAULT_STATION_DISTANCES_KM, seed=seed)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def earthquake_figure(magnitude, duration, seed):
+    """Stacked, normalized seismogram record section for one magnitude/duration/seed"""
+    time, traces, arrivals = earthquake_record(magnitude, duration, seed)
+    
+    # Create earthquake wave plot: one normalized trace per station, stacked
+    fig = go.Figure()
+    for i, distance in enumerate(DEFAULT_STATION_DISTANCES_KM):
+        peak = np.abs(traces[i]).max()
+        offset = len(DEFAULT_STATION_DISTANCES_KM) - 1 - i
+        fig.add_trace(go.Scatter(
+            x=time, y=traces[i] / (2 * peak if peak > 0 else 1) + offset, mode='lines',
+            name=f'{distance:.0f} km away (peak {peak:.3g} mm)'
+        ))
+        for phase, symbol in (("P", "triangle-up"), ("S", "diamond")):
+            arrival = arrivals[phase][i]
+            if arrival <= duration:
+                fig.add_trace(go.Scatter(
+                    x=[arrival], y=[offset + 0.5], mode='markers+text', text=[phase],
+                    textposition='top center', marker=dict(symbol=symbol, size=10, color='black'),
+                    showlegend=False
+                ))
+    fig.update_layout(
+        title="Simulated Earthquake Waves",
+        xaxis_title="Time (seconds)",
+        yaxis_title="Station (nearest at top)",
+        yaxis=dict(showticklabels=False),
+        height=400
+    )
+    return fig
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def tsunami_results(trigger, distance, depth):
+    """Tsunami characteristics plus the speed and height gauges for one scenario"""
+    result = tsunami_characteristics(trigger, distance, depth)
+
+    # Speed gauge
+    fig_speed = go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = result["speed"],
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Wave Speed (km/h)"},
+        gauge = {
+            'axis': {'range': [0, 1000]},
+            'bar': {'color': "blue"},
+            'steps': [
+                {'range': [0, 400], 'color': "lightblue"},
+                {'range': [400, 700], 'color': "royalblue"},
+                {'range': [700, 1000], 'color': "darkblue"}
+            ]
+        }
+    ))
+    fig_speed.update_layout(height=250)
+    
+    # Wave height gauge
+    fig_height = go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = result["wave_height"],
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Wave Height (meters)"},
+        gauge = {
+            'axis': {'range': [0, 20]},
+            'bar': {'color': "cyan"},
+            'steps': [
+                {'range': [0, 5], 'color': "lightcyan"},
+                {'range': [5, 10], 'color': "turquoise"},
+                {'range': [10, 20], 'color': "teal"}
+            ]
+        }
+    ))
+    fig_height.update_layout(height=250)
+    return result, fig_speed, fig_height
+
+def tsunami_grid(distance, depth, resolution_km, bathymetry=None, bathymetry_name="", file_spacing_km=1.0):
+    """(sea_floor, dx_m, source) from the synthetic coastline or an uploaded depth grid"""
+    if bathymetry is None:
+        return synthetic_bathymetry(distance, depth, resolution_km)
+    stride = max(int(round(resolution_km / file_spacing_km)), 1)
+    upload = io.BytesIO(bathymetry)
+    upload.name = bathymetry_name
+    sea_floor = load_bathymetry(upload, stride)
+    # No fault position in a plain depth grid: start the wave over the deepest water
+    source = np.unravel_index(np.argmax(sea_floor), sea_floor.shape)
+    return sea_floor, file_spacing_km * 1000 * stride, source
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL_SECONDS, show_spinner="Propagating the wave over the sea floor...")
+def tsunami_propagation(trigger, distance, depth, resolution_km, time_budget_s,
+                        bathymetry=None, bathymetry_name="", file_spacing_km=1.0):
+    """2-D shallow-water run plus its amplitude map and coastline profile figures"""
+    sea_floor, dx_m, source = tsunami_grid(distance, depth, resolution_km, bathymetry,
+                                           bathymetry_name, file_spacing_km)
+    run = simulate_propagation(sea_floor, dx_m, source, SOURCE_AMPLITUDE[trigger],
+                               time_budget_s=time_budget_s)
+    return propagation_figures(run, sea_floor, source)
+
+def propagation_figures(run, sea_floor, source):
+    """Summary, amplitude map and coastline profile for a simulate_propagation result"""
+    km = run["dx_m"] / 1000.0
+    rows, cols = sea_floor.shape
+    x = (np.arange(cols) + 0.5) * km
+    y = (np.arange(rows) + 0.5) * km
+    coast_rows, coast_cols = run["coast"]
+
+    # Highest water reached everywhere, with arrival-time contours every 15 minutes
+    fig_map = go.Figure()
+    fig_map.add_trace(go.Heatmap(
+        x=x, y=y, z=np.where(sea_floor > 0, run["max_amplitude"], np.nan),
+        colorscale="Blues", zmin=0, zmax=float(np.percentile(run["max_amplitude"], 99)),
+        colorbar=dict(title="Max height (m)")
+    ))
+    fig_map.add_trace(go.Contour(
+        x=x, y=y, z=run["arrival"] / 3600, showscale=False, hoverinfo="skip",
+        contours=dict(coloring="lines", showlabels=True, start=0, size=0.25),
+        line=dict(color="white", width=1), name="Arrival (h)"
+    ))
+    fig_map.add_trace(go.Scatter(
+        x=x[coast_cols], y=y[coast_rows], mode="markers", name="Coastline",
+        marker=dict(size=5, color=run["coast_max"], colorscale="YlOrRd", showscale=False),
+        text=[f"{a / 3600:.2f} h, {m:.1f} m" for a, m in zip(run["coast_arrival"], run["coast_max"])],
+        hoverinfo="text"
+    ))
+    fig_map.add_trace(go.Scatter(
+        x=[x[source[1]]], y=[y[source[0]]], mode="markers", name="Source",
+        marker=dict(symbol="star", size=14, color="red")
+    ))
+    fig_map.update_layout(
+        title="Maximum Wave Height and Arrival Time (hours)",
+        xaxis_title="Distance (km)", yaxis_title="Along the coast (km)",
+        yaxis=dict(scaleanchor="x"), height=500, showlegend=False
+    )
+
+    # Arrival time and height at each stretch of coastline
+    order = np.argsort(coast_rows, kind="stable")
+    fig_coast = go.Figure()
+    fig_coast.add_trace(go.Scatter(
+        x=y[coast_rows[order]], y=run["coast_max"][order], mode="lines", name="Wave height (m)"
+    ))
+    fig_coast.add_trace(go.Scatter(
+        x=y[coast_rows[order]], y=run["coast_arrival"][order] / 3600, mode="lines",
+        name="Arrival time (h)", yaxis="y2"
+    ))
+    fig_coast.update_layout(
+        title="Along the Coastline",
+        xaxis_title="Along the coast (km)",
+        yaxis=dict(title="Wave height (m)"),
+        yaxis2=dict(title="Arrival time (h)", overlaying="y", side="right"),
+        height=350
+    )
+
+    summary = {
+        "first_arrival": float(np.nanmin(run["coast_arrival"])) if np.isfinite(run["coast_arrival"]).any() else None,
+        "max_height": float(run["coast_max"].max()) if run["coast_max"].size else 0.0,
+        "median_height": float(np.median(run["coast_max"])) if run["coast_max"].size else 0.0,
+        "grid": sea_floor.shape,
+        "dx_km": km,
+        "steps": run["steps"],
+        "sim_hours": float(run["sim_seconds"]) / 3600,
+        "wall_seconds": run["wall_seconds"],
+        "completed": run["completed"],
+    }
+    return summary, fig_map, fig_coast
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def hurricane_simulation(intensity, resolution_km):
+    """Wind field for every hour of the storm and the surge along the coast"""
+    return simulate_hurricane(intensity, resolution_km)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def hurricane_wind_map(intensity, resolution_km, hour):
+    """Wind speed map at one hour (or the strongest wind over the storm if hour is None)"""
+    sim = hurricane_simulation(intensity, resolution_km)
+    track = sim["track"]
+    wind = sim["swath"] if hour is None else sim["speed"][hour]
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=sim["x"], y=sim["y"], z=np.round(wind * MPS_TO_MPH), colorscale="Turbo", zmin=0, zmax=200,
+        colorbar=dict(title="Wind (mph)"), hovertemplate="%{z} mph<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(x=sim["coast_x"], y=sim["coast_y"], mode="lines", name="Coastline",
+                             line=dict(color="white", width=3)))
+    last = len(track["hours"]) - 1 if hour is None else hour
+    fig.add_trace(go.Scatter(x=track["x"][:last + 1], y=track["y"][:last + 1], mode="lines",
+                             name="Storm track", line=dict(color="black", dash="dot")))
+    if hour is not None:
+        fig.add_trace(go.Scatter(x=[track["x"][hour]], y=[track["y"][hour]], mode="markers", name="Eye",
+                                 marker=dict(symbol="circle-open", size=14, color="black", line=dict(width=3))))
+    fig.update_layout(
+        title="Strongest Wind During the Storm" if hour is None else f"Wind {hour} Hours into the Storm",
+        xaxis=dict(title="Distance (km)", range=[sim["x"][0], sim["x"][-1]]),
+        yaxis=dict(title="Distance (km)", range=[sim["y"][0], sim["y"][-1]], scaleanchor="x"),
+        height=500, showlegend=False
+    )
+    return fig
+
+def band_figure(x, bands, title, xaxis_title, yaxis_title):
+    """Median line with shaded 25-75% and 5-95% bands across ensemble members"""
+    p5, p25, p50, p75, p95 = bands
+    fig = go.Figure()
+    for low, high, label, alpha in ((p5, p95, "5-95%", 0.2), (p25, p75, "25-75%", 0.4)):
+        fig.add_trace(go.Scatter(x=x, y=high, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=x, y=low, mode="lines", line=dict(width=0), fill="tonexty",
+                                 fillcolor=f"rgba(31, 119, 180, {alpha})", name=label))
+    fig.add_trace(go.Scatter(x=x, y=p50, mode="lines", line=dict(color="rgb(31, 119, 180)"), name="Median"))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title, height=350)
+    return fig
+
+def exceedance_figure(thresholds, probabilities, title, xaxis_title, log_x=False):
+    """Chance (%) that the result is bigger than each threshold"""
+    fig = go.Figure(go.Scatter(x=thresholds, y=probabilities * 100, mode="lines+markers"))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title="Chance of being bigger (%)",
+                      xaxis_type="log" if log_x else "linear", yaxis_range=[0, 100], height=350)
+    return fig
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL_SECONDS, show_spinner="Running the ensemble...")
+def earthquake_ensemble(magnitude, duration, members, seed):
+    """Percentile bands and exceedance curve for many perturbed earthquakes"""
+    result = run_ensemble("earthquake", dict(magnitude=magnitude, duration=duration), members, seed,
+                          get_process_pool(), ENSEMBLE_WORKERS)
+    thresholds = spread_thresholds(result["scalars"][:, 0], QUAKE_THRESHOLD_COUNT)
+    nearest = DEFAULT_STATION_DISTANCES_KM[0]
+    time_axis = (np.arange(result["profiles"].shape[1]) + 0.5) / ENVELOPE_RATE_HZ
+    fig_band = band_figure(time_axis, result["profile_bands"], f"Shaking {nearest:.0f} km Away in {members} Possible Quakes",
+                           "Time (seconds)", "Ground motion (mm)")
+    fig_exceed = exceedance_figure(thresholds, exceedance(result["scalars"], thresholds)[:, 0],
+                                   f"How Likely Is Strong Shaking {nearest:.0f} km Away?",
+                                   "Peak ground motion (mm)", log_x=True)
+    return result["scalar_bands"], fig_band, fig_exceed
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL_SECONDS, show_spinner="Running the ensemble...")
+def tsunami_ensemble(trigger, distance, depth, members, seed, resolution_km):
+    """Percentile bands and exceedance curve for many perturbed tsunamis"""
+    params = dict(trigger=trigger, distance=distance, depth=depth, resolution_km=resolution_km)
+    result = run_ensemble("tsunami", params, members, seed, get_process_pool(), ENSEMBLE_WORKERS,
+                          TSUNAMI_THRESHOLDS_M)
+    along_coast = (np.arange(result["profiles"].shape[1]) + 0.5) * resolution_km
+    fig_band = band_figure(along_coast, result["profile_bands"], f"Highest Wave Along the Coast in {members} Possible Tsunamis",
+                           "Along the coast (km)", "Wave height (m)")
+    fig_exceed = exceedance_figure(TSUNAMI_THRESHOLDS_M, result["exceedance"][:, 1],
+                                   "How Likely Is a Wave This Big Somewhere on the Coast?", "Wave height (m)")
+    return result["scalar_bands"], fig_band, fig_exceed
+
+def seismogram_frames(time, step_seconds):
+    """Lazily yield (t, end): the record is shown up to sample end, step_seconds more each frame"""
+    sample_rate = 1.0 / (time[1] - time[0])
+    step = max(int(step_seconds * sample_rate), 1)
+    for end in range(step, len(time) + step, step):
+        end = min(end, len(time))
+        yield time[end - 1], end
+
+def seismogram_frame_figure(time, traces, end, duration):
+    """Record section drawn up to sample end, on fixed axes so frames line up"""
+    fig = go.Figure()
+    for i, distance in enumerate(DEFAULT_STATION_DISTANCES_KM):
+        peak = np.abs(traces[i]).max()
+        offset = len(DEFAULT_STATION_DISTANCES_KM) - 1 - i
+        fig.add_trace(go.Scatter(
+            x=time[:end], y=traces[i, :end] / (2 * peak if peak > 0 else 1) + offset, mode='lines',
+            name=f'{distance:.0f} km away'
+        ))
+    fig.update_layout(
+        title=f"Recording... {time[end - 1]:.1f} s",
+        xaxis=dict(title="Time (seconds)", range=[0, duration]),
+        yaxis=dict(showticklabels=False, range=[-0.7, len(DEFAULT_STATION_DISTANCES_KM) - 0.3]),
+        height=400
+    )
+    return fig
+
+def wave_frame_heatmap(eta, km, wet, amplitude, sim_time):
+    """Heatmap trace of the sea surface at one instant; land is left blank"""
+    rows, cols = eta.shape
+    return go.Heatmap(
+        x=(np.arange(cols) + 0.5) * km, y=(np.arange(rows) + 0.5) * km,
+        # Centimetres are plenty on screen and keep each frame's JSON small
+        z=np.where(wet, np.round(eta, 2), np.nan), colorscale="RdBu", reversescale=True,
+        zmin=-amplitude / 2, zmax=amplitude / 2, colorbar=dict(title="Sea level (m)"),
+        name=f"{sim_time / 3600:.2f} h"
+    )
+
+def wave_frame_layout(sim_time):
+    return dict(
+        title=f"Sea Surface after {sim_time / 3600:.2f} hours",
+        xaxis_title="Distance (km)", yaxis_title="Along the coast (km)",
+        yaxis=dict(scaleanchor="x"), height=500
+    )
+
+def wave_replay_figure(frames, km, wet, amplitude):
+    """Plotly animation of the retained frames with a play button and time slider"""
+    first_time, first_eta = frames[0]
+    fig = go.Figure(
+        data=[wave_frame_heatmap(first_eta, km, wet, amplitude, first_time)],
+        frames=[go.Frame(data=[wave_frame_heatmap(eta, km, wet, amplitude, t)], name=f"{t / 3600:.2f} h",
+                         layout=dict(title=f"Sea Surface after {t / 3600:.2f} hours"))
+                for t, eta in frames]
+    )
+    fig.update_layout(
+        **wave_frame_layout(first_time),
+        updatemenus=[dict(type="buttons", showactive=False, buttons=[
+            dict(label="▶ Replay", method="animate",
+                 args=[None, dict(frame=dict(duration=150, redraw=True), fromcurrent=True)])
+        ])],
+        sliders=[dict(steps=[
+            dict(label=f"{t / 3600:.2f} h", method="animate",
+                 args=[[f"{t / 3600:.2f} h"], dict(mode="immediate", frame=dict(redraw=True))])
+            for t, _ in frames
+        ])]
+    )
+    return fig
+
+def animate_propagation(run, sea_floor, dx_m, amplitude):
+    """Play a PropagationRun frame by frame until it stops, then leave a replay of the end"""
+    frames = AdaptiveFrames(run.frames(run.expected_seconds / ANIMATION_FRAMES, ANIMATION_MAX_CELLS),
+                            window=REPLAY_FRAMES)
+    stride = max(int(np.ceil(np.sqrt(sea_floor.size / ANIMATION_MAX_CELLS))), 1)
+    wet = sea_floor[::stride, ::stride] > 0
+    km = dx_m / 1000.0 * stride
+    chart = st.empty()
+    for sim_time, eta in frames:
+        fig = go.Figure(wave_frame_heatmap(eta, km, wet, amplitude, sim_time))
+        fig.update_layout(**wave_frame_layout(sim_time))
+        chart.plotly_chart(fig, use_container_width=True)
+    chart.plotly_chart(wave_replay_figure(list(frames.recent), km, wet, amplitude), use_container_width=True)
+    st.caption(f"Showed {frames.shown} frames and skipped {frames.skipped} to keep up; "
+               f"the last {len(frames.recent)} can be replayed.")
 
 # Page config
 st.title("Interactive Simulations 🔬")
@@ -19,22 +389,26 @@ with tab1:
     # Earthquake simulation controls
     intensity = st.slider("Select Earthquake Intensity (Richter Scale)", 1.0, 9.0, 5.0, 0.1)
     duration = st.slider("Duration (seconds)", 1, 30, 10)
+    seed = st.number_input("Random seed (same seed = same waves)", 0, 9999, 42)
+    animate_quake = st.toggle("Animate the recording", key="animate_quake")
     
     if st.button("Simulate Earthquake"):
-        # Generate simulated earthquake data
-        time = np.linspace(0, duration, 100)
-        amplitude = np.sin(time) * intensity * np.random.random(100)
-        
-        # Create earthquake wave plot
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=time, y=amplitude, mode='lines', name='Seismic Waves'))
-        fig.update_layout(
-            title="Simulated Earthquake Waves",
-            xaxis_title="Time (seconds)",
-            yaxis_title="Wave Amplitude",
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        magnitude = quantize(intensity, 0.1)
+        if animate_quake:
+            # Draw the record as it comes in; the finished figure replaces the last frame
+            chart = st.empty()
+            time_axis, traces, _ = earthquake_record(magnitude, int(duration), int(seed))
+            frames = AdaptiveFrames(seismogram_frames(time_axis, SEISMOGRAM_FRAME_SECONDS),
+                                    target_interval=SEISMOGRAM_FRAME_SECONDS)
+            for _, end in frames:
+                chart.plotly_chart(seismogram_frame_figure(time_axis, traces, end, int(duration)),
+                                   use_container_width=True)
+            chart.plotly_chart(earthquake_figure(magnitude, int(duration), int(seed)), use_container_width=True)
+        else:
+            fig = earthquake_figure(magnitude, int(duration), int(seed))
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption("P waves arrive first, then the stronger S waves, then slow rolling surface waves. "
+                   "Stations farther away feel the shaking later and weaker.")
         
         # Show impact information
         st.info(f"At magnitude {intensity}, this earthquake would:")
@@ -49,6 +423,20 @@ with tab1:
             st.write("- Cause significant damage to buildings")
             st.write("- Require immediate evacuation")
 
+    # Ensemble: many quakes with slightly different magnitude and depth
+    with st.expander("🎲 What Could Happen? Run Many Possible Earthquakes"):
+        st.markdown("Nobody knows the exact magnitude and depth in advance, so we simulate many "
+                    "slightly different quakes and see how much the shaking varies.")
+        quake_members = st.select_slider("Number of earthquakes", [100, 250, 500, 1000], value=250)
+        if st.button("Run Earthquake Ensemble"):
+            bands, fig_band, fig_exceed = earthquake_ensemble(quantize(intensity, 0.1), int(duration),
+                                                              quake_members, int(seed))
+            st.plotly_chart(fig_band, use_container_width=True)
+            st.plotly_chart(fig_exceed, use_container_width=True)
+            st.info(f"Peak ground motion {DEFAULT_STATION_DISTANCES_KM[0]:.0f} km away: "
+                    f"{bands[2][0]:.3g} mm typically, from {bands[0][0]:.3g} to {bands[-1][0]:.3g} mm "
+                    "in 9 out of 10 runs. The same seed always gives the same ensemble.")
+
 # Hurricane Simulator
 with tab2:
     st.subheader("Hurricane Intensity Simulator 🌪️")
@@ -61,6 +449,8 @@ with tab2:
     )
     
     if st.button("Show Hurricane Details"):
+        storm = hurricane_simulation(intensity, 10)
+        
         # Create columns for organized display
         col1, col2 = st.columns(2)
         
@@ -129,13 +519,10 @@ with tab2:
         with col1:
             st.markdown(f"### Hurricane Characteristics")
             
-            # Create gauge for wind speed
-            max_speeds = {"Low": 95, "Moderate": 129, "High": 156, "Extreme": 200}
-            min_speeds = {"Low": 74, "Moderate": 96, "High": 130, "Extreme": 157}
-            
+            # Create gauge for the simulated peak wind speed
             fig = go.Figure(go.Indicator(
                 mode = "gauge+number+delta",
-                value = (min_speeds[intensity] + max_speeds[intensity]) / 2,
+                value = round(storm["peak_wind_mph"]),
                 domain = {'x': [0, 1], 'y': [0, 1]},
                 title = {'text': "Wind Speed (mph)"},
                 gauge = {
@@ -156,7 +543,7 @@ with tab2:
             st.markdown(f"""
             - **Category**: {info['category']}
             - **Wind Speed**: {info['wind_speed']}
-            - **Storm Surge**: {info['storm_surge']}
+            - **Storm Surge**: {info['storm_surge']} (simulated peak: {storm['peak_surge_feet']:.0f} feet)
             - **Temperature**: {info['temperature']}
             """)
         
@@ -173,6 +560,33 @@ with tab2:
             </div>
             """, unsafe_allow_html=True)
 
+    # Wind field simulation: cached per intensity and grid resolution, so
+    # moving the hour slider only looks up a precomputed map
+    st.markdown("### Watch the Storm Move 🗺️")
+    map_col1, map_col2 = st.columns(2)
+    with map_col1:
+        wind_resolution = st.select_slider("Map detail (km per square)", [20, 10, 5], value=10)
+    with map_col2:
+        show_swath = st.toggle("Show the strongest wind over the whole storm")
+    storm = hurricane_simulation(intensity, wind_resolution)
+    if show_swath:
+        hour = None
+    else:
+        hour = st.slider("Hours since the storm formed", 0, TRACK_HOURS, storm["landfall_hour"] or 0)
+    st.plotly_chart(hurricane_wind_map(intensity, wind_resolution, hour), use_container_width=True)
+    if storm["landfall_hour"] is not None:
+        st.caption(f"The eye reaches the coast after {storm['landfall_hour']} hours. Winds spin anticlockwise "
+                   "and blow hardest on the right of the track, then weaken over land.")
+
+    fig_surge = go.Figure(go.Scatter(
+        x=storm["coast_x"], y=storm["surge"] * M_TO_FEET, mode="lines", fill="tozeroy", name="Storm surge"
+    ))
+    fig_surge.update_layout(
+        title="Storm Surge Along the Coast", xaxis_title="Along the coast (km)",
+        yaxis_title="Highest water (feet)", height=300
+    )
+    st.plotly_chart(fig_surge, use_container_width=True)
+
 # Tsunami Simulator
 with tab3:
     st.subheader("Tsunami Simulator 🌊")
@@ -201,64 +615,43 @@ with tab3:
         help="Average depth of the ocean where tsunami is traveling"
     )
 
+    # 2-D propagation settings
+    sea_floor = st.radio("Sea floor", ["Synthetic coastline", "Bathymetry file"], horizontal=True)
+    bathymetry = None
+    bathymetry_name = ""
+    file_spacing_km = 1.0
+    if sea_floor == "Bathymetry file":
+        upload = st.file_uploader(
+            "Depth grid (.npy or .csv, metres below sea level, land <= 0)", type=["npy", "csv", "txt"]
+        )
+        file_spacing_km = st.number_input("Grid spacing of the file (km)", 0.1, 50.0, 1.0, 0.1)
+        if upload is not None:
+            # Raw bytes make a stable cache key for the uploaded grid
+            bathymetry, bathymetry_name = upload.getvalue(), upload.name
+    resolution_km = st.select_slider(
+        "Simulation grid resolution (km)", [10, 5, 2, 1], value=5,
+        help="Finer grids are more detailed but take longer"
+    )
+    time_budget = st.slider(
+        "Time budget (seconds)", 1, 10, 3,
+        help="The simulation stops early if it takes longer than this"
+    )
+    animate_tsunami = st.toggle("Animate the wave", key="animate_tsunami")
+
     if st.button("Simulate Tsunami"):
-        # Calculate tsunami characteristics
-        speed = round(np.sqrt(9.8 * depth) * 3.6, 2)  # Convert m/s to km/h
-        
-        # Estimated wave height based on trigger and distance
-        base_height = {
-            "Underwater Earthquake": 15,
-            "Volcanic Eruption": 20,
-            "Landslide": 10
-        }
-        
-        # Wave height decreases with distance
-        wave_height = round(base_height[trigger] * (1 - (distance/2000)), 1)
-        wave_height = max(wave_height, 2)  # Minimum wave height
-        
-        # Estimated arrival time
-        arrival_time = round(distance / speed, 2)  # hours
+        # Calculate tsunami characteristics (memoized per trigger/distance/depth)
+        result, fig_speed, fig_height = tsunami_results(trigger, int(distance), int(depth))
+        speed = result["speed"]
+        wave_height = result["wave_height"]
+        arrival_time = result["arrival_time"]
+        warning_color = result["warning_color"]
+        warning_level = result["warning_level"]
         
         # Create visualization
         col1, col2 = st.columns(2)
         
         with col1:
-            # Speed gauge
-            fig_speed = go.Figure(go.Indicator(
-                mode = "gauge+number",
-                value = speed,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': "Wave Speed (km/h)"},
-                gauge = {
-                    'axis': {'range': [0, 1000]},
-                    'bar': {'color': "blue"},
-                    'steps': [
-                        {'range': [0, 400], 'color': "lightblue"},
-                        {'range': [400, 700], 'color': "royalblue"},
-                        {'range': [700, 1000], 'color': "darkblue"}
-                    ]
-                }
-            ))
-            fig_speed.update_layout(height=250)
             st.plotly_chart(fig_speed, use_container_width=True)
-            
-            # Wave height gauge
-            fig_height = go.Figure(go.Indicator(
-                mode = "gauge+number",
-                value = wave_height,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': "Wave Height (meters)"},
-                gauge = {
-                    'axis': {'range': [0, 20]},
-                    'bar': {'color': "cyan"},
-                    'steps': [
-                        {'range': [0, 5], 'color': "lightcyan"},
-                        {'range': [5, 10], 'color': "turquoise"},
-                        {'range': [10, 20], 'color': "teal"}
-                    ]
-                }
-            ))
-            fig_height.update_layout(height=250)
             st.plotly_chart(fig_height, use_container_width=True)
 
         with col2:
@@ -274,17 +667,6 @@ with tab3:
             - Ocean Depth: {depth} meters
             """)
             
-            # Warning level based on wave height
-            if wave_height < 5:
-                warning_color = "yellow"
-                warning_level = "MODERATE"
-            elif wave_height < 10:
-                warning_color = "orange"
-                warning_level = "HIGH"
-            else:
-                warning_color = "red"
-                warning_level = "EXTREME"
-                
             st.markdown(f"""
             <div style='padding: 10px; background-color: {warning_color}; 
                         border-radius: 5px; text-align: center; margin: 10px 0;'>
@@ -292,6 +674,47 @@ with tab3:
             </div>
             """, unsafe_allow_html=True)
 
+        # Wave propagation over the sea floor (memoized per scenario and grid)
+        st.markdown("### Wave Propagation Over the Sea Floor")
+        file_spacing_km = quantize(file_spacing_km, 0.1)
+        try:
+            if animate_tsunami:
+                # The animation drives the same run the maps below come from:
+                # frames are computed one at a time while they are shown, so
+                # the first appears at once; slow connections get every 2nd,
+                # 4th... frame
+                st.markdown("#### Watch the Wave Travel")
+                sea_floor, dx_m, source = tsunami_grid(int(distance), int(depth), int(resolution_km), bathymetry,
+                                                       bathymetry_name, file_spacing_km)
+                run = PropagationRun(sea_floor, dx_m, source, SOURCE_AMPLITUDE[trigger],
+                                     time_budget_s=int(time_budget))
+                animate_propagation(run, sea_floor, dx_m, SOURCE_AMPLITUDE[trigger])
+                propagation, fig_map, fig_coast = propagation_figures(run.result(), sea_floor, source)
+            else:
+                propagation, fig_map, fig_coast = tsunami_propagation(
+                    trigger, int(distance), int(depth), int(resolution_km), int(time_budget),
+                    bathymetry, bathymetry_name, file_spacing_km
+                )
+        except ValueError as e:
+            st.error(f"Could not read the bathymetry file: {e}")
+        else:
+            col1, col2, col3 = st.columns(3)
+            first_arrival = propagation["first_arrival"]
+            col1.metric("First Wave Reaches Coast",
+                        f"{first_arrival / 3600:.2f} h" if first_arrival is not None else "Not yet")
+            col2.metric("Highest Wave on Coast", f"{propagation['max_height']:.1f} m")
+            col3.metric("Typical Wave on Coast", f"{propagation['median_height']:.1f} m")
+            st.plotly_chart(fig_map, use_container_width=True)
+            st.plotly_chart(fig_coast, use_container_width=True)
+            rows, cols = propagation["grid"]
+            st.caption(
+                f"{rows} x {cols} grid at {propagation['dx_km']:g} km, {propagation['steps']} steps covering "
+                f"{propagation['sim_hours']:.2f} h of wave travel in {propagation['wall_seconds']:.2f} s."
+            )
+            if not propagation["completed"]:
+                st.warning("The time budget ran out before the wave finished reaching the coast. "
+                           "Try a coarser grid or a bigger time budget.")
+
         # Safety precautions based on warning level
         st.markdown("### Safety Precautions")
         
@@ -346,6 +769,24 @@ with tab3:
                 - Go to the beach to watch
             """)
 
+    # Ensemble: many tsunamis with uncertain depth, distance and source size
+    with st.expander("🎲 What Could Happen? Run Many Possible Tsunamis"):
+        st.markdown("The depth, the distance and the size of the first wave are never known exactly, "
+                    "so we simulate many slightly different tsunamis on a 10 km grid.")
+        ens_col1, ens_col2 = st.columns(2)
+        with ens_col1:
+            tsunami_members = st.select_slider("Number of tsunamis", [50, 100, 200, 500], value=100)
+        with ens_col2:
+            tsunami_seed = st.number_input("Random seed", 0, 9999, 42, key="tsunami_ensemble_seed")
+        if st.button("Run Tsunami Ensemble"):
+            bands, fig_band, fig_exceed = tsunami_ensemble(trigger, int(distance), int(depth),
+                                                           tsunami_members, int(tsunami_seed), 10)
+            st.plotly_chart(fig_band, use_container_width=True)
+            st.plotly_chart(fig_exceed, use_container_width=True)
+            st.info(f"First wave reaches the coast after {bands[2][0]:.2f} hours typically "
+                    f"({bands[0][0]:.2f} to {bands[-1][0]:.2f} hours in 9 out of 10 runs); "
+                    f"the highest wave is {bands[2][1]:.1f} m typically, up to {bands[-1][1]:.1f} m.")
+
 # Add helpful tips
 with st.expander("How to Use the Simulations 🎯"):
     st.markdown("""
@@ -354,11 +795,13 @@ with st.expander("How to Use the Simulations 🎯"):
     #### Earthquake Simulator 🌋
     - Adjust the intensity to see different earthquake strengths
     - Watch how the seismic waves change
+    - Run an ensemble to see the range of shaking that could happen
     - Learn about safety measures for each intensity level
     
     #### Hurricane Simulator 🌪️
     - Select different intensity levels
     - Learn about wind speeds and storm surge
+    - Move the hour slider to watch the storm cross the coast
     - Understand safety precautions for each level
     
     #### Tsunami Simulator 🌊
@@ -0,0 +1,132 @@
+import heapq
+import math
+import numpy as np
+from typing import List, Optional, Tuple
+
+from safety_world import Point, RoomWorld
+
+# Walking through a hazard cell costs this many ordinary cells, so routes go
+# around hazards whenever there is a way, but one still exists from inside one
+HAZARD_COST = 50.0
+
+# 8-connected moves: (d_row, d_col, length in cells)
+NEIGHBOURS = [(dr, dc, math.hypot(dr, dc)) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+def cell_mask(world: RoomWorld, kind: str) -> np.ndarray:
+    """Occupancy cells whose centre lies inside an object of the given kind"""
+    xs = world.x_min + np.arange(world.cols) * world.cell_size
+    ys = world.y_min + np.arange(world.rows) * world.cell_size
+    mask = np.zeros((world.rows, world.cols), dtype=bool)
+    for obj in world.objects:
+        if obj.kind == kind:
+            inside_x = (xs > obj.x0) & (xs < obj.x1)
+            inside_y = (ys > obj.y0) & (ys < obj.y1)
+            mask |= inside_y[:, None] & inside_x[None, :]
+    return mask
+
+def cost_grid(world: RoomWorld, hazard: Optional[np.ndarray] = None, hazard_cost: float = HAZARD_COST) -> np.ndarray:
+    """Cost of entering each cell: 1 normally, hazard_cost in hazards, inf in walls"""
+    if hazard is None:
+        hazard = cell_mask(world, "hazard")
+    cost = np.where(hazard, hazard_cost, 1.0)
+    cost[world.blocked] = np.inf
+    return cost
+
+def distance_field(cost: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Multi-source Dijkstra: cheapest cost from every cell to any target cell.
+
+    Diagonal steps may not cut the corner of a wall. Cells that can't reach
+    a target are inf.
+    """
+    rows, cols = cost.shape
+    dist = np.full(cost.shape, np.inf)
+    heap: List[Tuple[float, int, int]] = []
+    for r, c in zip(*np.nonzero(targets & np.isfinite(cost))):
+        dist[r, c] = 0.0
+        heap.append((0.0, int(r), int(c)))
+    heapq.heapify(heap)
+    blocked = ~np.isfinite(cost)
+    while heap:
+        d, r, c = heapq.heappop(heap)
+        if d > dist[r, c]:
+            continue
+        for dr, dc, length in NEIGHBOURS:
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < rows and 0 <= nc < cols) or blocked[nr, nc]:
+                continue
+            if dr and dc and (blocked[r, nc] or blocked[nr, c]):
+                continue
+            # Moving between cells costs the mean of the two, times the step length
+            nd = d + length * 0.5 * (cost[r, c] + cost[nr, nc])
+            if nd < dist[nr, nc]:
+                dist[nr, nc] = nd
+                heapq.heappush(heap, (nd, nr, nc))
+    return dist
+
+class RoutePlanner:
+    """Distance-to-safety field for one room, plus the best move from every cell.
+
+    The field is computed once (Dijkstra from every safe-zone cell at once);
+    after that a hint is a lookup in best_move and the full route is a walk
+    downhill through the field.
+    """
+
+    def __init__(self, world: RoomWorld, step: float = 0.5, hazard: Optional[np.ndarray] = None,
+                 target_kind: str = "safe"):
+        self.world = world
+        self.step = step
+        self.cost = cost_grid(world, hazard)
+        self.dist = distance_field(self.cost, cell_mask(world, target_kind))
+        self.moves = [(0.0, step), (-step, 0.0), (0.0, -step), (step, 0.0)]
+        self.best_move = self._best_moves()
+
+    def _best_moves(self) -> np.ndarray:
+        """Index into self.moves that gets closest to safety from each cell, -1 if none helps"""
+        k = int(round(self.step / self.world.cell_size))
+        rows, cols = self.dist.shape
+        padded = np.pad(self.dist, k, constant_values=np.inf)
+        candidates = np.full((len(self.moves), rows, cols), np.inf)
+        for i, (dx, dy) in enumerate(self.moves):
+            dr, dc = int(round(dy / self.world.cell_size)), int(round(dx / self.world.cell_size))
+            candidates[i] = padded[k + dr:k + dr + rows, k + dc:k + dc + cols]
+        best = np.argmin(candidates, axis=0)
+        improves = np.take_along_axis(candidates, best[None], axis=0)[0] < self.dist
+        return np.where(improves, best, -1)
+
+    def distance(self, point: Point) -> float:
+        """Distance (room units) to the nearest safe zone, walking around walls"""
+        row, col = self.world.cell(point)
+        if not (0 <= row < self.dist.shape[0] and 0 <= col < self.dist.shape[1]):
+            return math.inf
+        return float(self.dist[row, col] * self.world.cell_size)
+
+    def hint(self, point: Point) -> Optional[Tuple[float, float]]:
+        """The (dx, dy) move that heads for safety, or None if already there or stuck"""
+        row, col = self.world.cell(point)
+        if not (0 <= row < self.dist.shape[0] and 0 <= col < self.dist.shape[1]):
+            return None
+        move = self.best_move[row, col]
+        return self.moves[move] if move >= 0 else None
+
+    def route(self, point: Point, max_cells: int = 10000) -> List[Point]:
+        """Shortest safe route from point to the nearest safe zone, as room points"""
+        row, col = self.world.cell(point)
+        rows, cols = self.dist.shape
+        if not (0 <= row < rows and 0 <= col < cols) or not np.isfinite(self.dist[row, col]):
+            return []
+        path = [self.world.cell_center(row, col)]
+        for _ in range(max_cells):
+            if self.dist[row, col] == 0:
+                break
+            best = None
+            for dr, dc, _ in NEIGHBOURS:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < rows and 0 <= nc < cols and (best is None or self.dist[nr, nc] < self.dist[best]):
+                    if dr and dc and (not np.isfinite(self.cost[row, nc]) or not np.isfinite(self.cost[nr, col])):
+                        continue
+                    best = (nr, nc)
+            if best is None or self.dist[best] >= self.dist[row, col]:
+                break
+            row, col = best
+            path.append(self.world.cell_center(row, col))
+        return path
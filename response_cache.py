@@ -0,0 +1,138 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase, drop emojis/punctuation and collapse whitespace"""
+    text = unicodedata.normalize("NFKC", prompt).lower()
+    text = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in text)
+    return re.sub(r"\s+", " ", text).strip()
+
+# Words that don't change what is being asked; everything else (including
+# negations) must match exactly before a near-duplicate is reused
+STOPWORDS = frozenset("""
+a an the i me my we our you your it its this that these those there here
+is are was were be been am do does did doing done have has had
+what whats how when where which who why should would could can will shall may might must
+to of in on at for from with about into during by as and or if then so
+please tell explain kind some any thing things
+""".split())
+
+# "shouldn t" (normalized "shouldn't") -> "should not"
+CONTRACTED_NOT = re.compile(r"\b(\w+?)n t\b")
+IRREGULAR_NOT = {"ca": "can", "wo": "will", "sha": "shall"}
+
+def content_words(text: str) -> FrozenSet[str]:
+    """Non-stopword tokens of a normalized prompt, with "n't" spelled out as not"""
+    text = CONTRACTED_NOT.sub(lambda m: IRREGULAR_NOT.get(m.group(1), m.group(1)) + " not", text)
+    return frozenset(word for word in text.split() if word not in STOPWORDS)
+
+def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    """Character n-grams of a normalized prompt, padded so short words still count"""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+class ResponseCache:
+    """Thread-safe LRU cache of bot responses with TTL and near-duplicate lookup.
+
+    Entries are keyed on the normalized prompt. On an exact miss, an inverted
+    index of character n-grams finds the most similar cached prompt, and its
+    response is reused when the Jaccard similarity clears the threshold and
+    both prompts have the same content words, so "fire" never answers
+    "flood" and "should" never answers "shouldn't".
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600,
+                 similarity_threshold: float = 0.8, ngram_size: int = 3):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.ngram_size = ngram_size
+        self._entries: "OrderedDict[str, Tuple[str, float, FrozenSet[str], FrozenSet[str]]]" = OrderedDict()
+        self._index: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def get(self, prompt: str) -> Optional[str]:
+        key = normalize_prompt(prompt)
+        if not key:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+
+            match = self._nearest(key, now)
+            if match is not None:
+                self._entries.move_to_end(match)
+                self.near_hits += 1
+                return self._entries[match][0]
+
+            self.misses += 1
+            return None
+
+    def put(self, prompt: str, response: str):
+        key = normalize_prompt(prompt)
+        if not key:
+            return
+        grams = char_ngrams(key, self.ngram_size)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, time.monotonic() + self.ttl_seconds, grams, content_words(key))
+            for gram in grams:
+                self._index.setdefault(gram, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+            }
+
+    def _nearest(self, key: str, now: float) -> Optional[str]:
+        """Best live entry with the same content words by n-gram Jaccard
+        similarity, or None below the threshold"""
+        grams = char_ngrams(key, self.ngram_size)
+        words = content_words(key)
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self._index.get(gram, ()))
+
+        best_key, best_score = None, self.similarity_threshold
+        for candidate, shared in overlap.items():
+            entry = self._entries[candidate]
+            score = shared / (len(grams) + len(entry[2]) - shared)
+            if score >= best_score and entry[1] > now and entry[3] == words:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def _remove(self, key: str):
+        _, _, grams, _ = self._entries.pop(key)
+        for gram in grams:
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import numpy as np
+from typing import List, Optional, Sequence
+
+import shutil
+import plotly
+import plotly.graph_objects as go
+import streamlit as st
+import streamlit.components.v1 as components
+
+from safety_world import Point, RoomWorld
+
+COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "room_player")
+
+def install_plotly_js(component_dir: str = COMPONENT_DIR) -> bool:
+    """Copy plotly.min.js from the installed plotly package next to the
+    component, unless an identical copy is already there. Returns whether a
+    copy is in place; if not, the component falls back to reporting
+    {"plotly_missing": True}."""
+    source = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    target = os.path.join(component_dir, "plotly.min.js")
+    try:
+        wanted = os.stat(source)
+        if os.path.exists(target):
+            have = os.stat(target)
+            if have.st_size == wanted.st_size and have.st_mtime == wanted.st_mtime:
+                return True
+        shutil.copy2(source, target)
+    except OSError:
+        return os.path.exists(target)
+    return True
+
+# Plain HTML/JS frontend speaking the Streamlit component protocol
+# directly, so there is no build step; plotly.min.js is copied next to it
+# from the plotly package (not kept in git), so it matches the Python side
+# and works without internet access
+install_plotly_js()
+_component = components.declare_component("room_player", path=COMPONENT_DIR)
+
+def encode_grid(grid: np.ndarray, symbols: Optional[dict] = None) -> List[str]:
+    """One string per row, one character per cell: "1"/"0" for masks, or
+    symbols[value] for small integer grids"""
+    if symbols is None:
+        return ["".join("1" if cell else "0" for cell in row) for row in grid]
+    return ["".join(symbols[int(cell)] for cell in row) for row in grid]
+
+def room_player(figure: go.Figure, world: RoomWorld, position: Point, hazard: np.ndarray, safe: np.ndarray,
+                best_move: np.ndarray, moves: Sequence[Point], epoch: int, route: Optional[List[Point]] = None,
+                key: str = "room_player") -> Optional[dict]:
+    """Show the room and move the player in the browser.
+
+    figure is the static scene, with empty "You" and "Safest Route" traces
+    for the browser to fill. It and the grids for walls, hazards, safe
+    zones and hints are only sent when they change (or when the browser
+    asks for them after a reload); every other rerun sends just the
+    position and route. Arrow keys or the component's buttons move the
+    player by restyling its trace, and once the player stops the component
+    reports back {"position", "moves", "seq"}, so a whole burst of moves
+    costs one rerun. Bumping epoch puts the player back at position.
+    """
+    figure_json = figure.to_json()
+    grids = {
+        "blocked": encode_grid(world.blocked),
+        "hazard": encode_grid(hazard),
+        "safe": encode_grid(safe),
+        "hints": encode_grid(best_move, {-1: "x", 0: "0", 1: "1", 2: "2", 3: "3"}),
+    }
+    digest = hashlib.sha1(figure_json.encode())
+    for name, rows in grids.items():
+        digest.update(name.encode() + "".join(rows).encode())
+    scene_key = digest.hexdigest()
+
+    # Resend the scene if it changed since we last sent it, or if the
+    # browser has lost it (the component was remounted)
+    report = st.session_state.get(key) or {}
+    asked = report.get("need_scene") and report.get("seq") != st.session_state.get(f"{key}_scene_seq")
+    scene = None
+    if asked or st.session_state.get(f"{key}_scene_key") != scene_key:
+        scene = dict(grids, figure=figure_json, bounds=[world.x_min, world.y_min, world.x_max, world.y_max],
+                     cell_size=world.cell_size, moves=[list(move) for move in moves])
+        st.session_state[f"{key}_scene_key"] = scene_key
+        st.session_state[f"{key}_scene_seq"] = report.get("seq")
+
+    return _component(
+        scene_key=scene_key,
+        scene=scene,
+        position=list(position),
+        route=[list(point) for point in route] if route else [],
+        epoch=epoch,
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,201 @@
+import math
+import numpy as np
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+# Object kinds that nobody can walk through
+BLOCKING_KINDS = frozenset({"wall"})
+
+class RoomObject(NamedTuple):
+    """Axis-aligned box in room coordinates; the edges themselves are outside"""
+    kind: str
+    name: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+    def contains(self, point: Point) -> bool:
+        return self.x0 < point[0] < self.x1 and self.y0 < point[1] < self.y1
+
+    def distance(self, point: Point) -> float:
+        dx = max(self.x0 - point[0], 0.0, point[0] - self.x1)
+        dy = max(self.y0 - point[1], 0.0, point[1] - self.y1)
+        return math.hypot(dx, dy)
+
+    @property
+    def center(self) -> Point:
+        return ((self.x0 + self.x1) / 2, (self.y0 + self.y1) / 2)
+
+def point_object(kind: str, name: str, point: Point, radius: float = 0.5) -> RoomObject:
+    """Square of half-width radius around a point, like the old check_collision test"""
+    return RoomObject(kind, name, point[0] - radius, point[1] - radius, point[0] + radius, point[1] + radius)
+
+class RoomWorld:
+    """Occupancy grid plus a uniform-grid spatial index over room objects.
+
+    Every object is filed in each bucket_size x bucket_size bucket its box
+    overlaps, so "what is at this point" only looks at one bucket however
+    many objects the room has. Blocking objects (walls) are also rasterized
+    into a boolean occupancy grid of cell_size cells centred on multiples of
+    cell_size, which answers "can I stand here" with one array lookup and
+    line of sight by walking the cells between two points.
+    """
+
+    def __init__(self, bounds: Tuple[float, float, float, float], objects: Iterable[RoomObject] = (),
+                 cell_size: float = 0.25, bucket_size: float = 1.0):
+        self.x_min, self.y_min, self.x_max, self.y_max = bounds
+        self.cell_size = cell_size
+        self.bucket_size = bucket_size
+        self.cols = int(round((self.x_max - self.x_min) / cell_size)) + 1
+        self.rows = int(round((self.y_max - self.y_min) / cell_size)) + 1
+        self.blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        self.objects: List[RoomObject] = []
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._kind_counts: Dict[str, int] = defaultdict(int)
+        for obj in objects:
+            self.add(obj)
+
+    # --- indexing -----------------------------------------------------------
+
+    def _bucket(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor((x - self.x_min) / self.bucket_size), math.floor((y - self.y_min) / self.bucket_size))
+
+    def cell(self, point: Point) -> Tuple[int, int]:
+        """(row, col) of the occupancy cell whose centre is nearest to point"""
+        return (int(round((point[1] - self.y_min) / self.cell_size)),
+                int(round((point[0] - self.x_min) / self.cell_size)))
+
+    def cell_center(self, row: int, col: int) -> Point:
+        return (self.x_min + col * self.cell_size, self.y_min + row * self.cell_size)
+
+    def add(self, obj: RoomObject) -> int:
+        index = len(self.objects)
+        self.objects.append(obj)
+        self._kind_counts[obj.kind] += 1
+        bx0, by0 = self._bucket(obj.x0, obj.y0)
+        bx1, by1 = self._bucket(obj.x1, obj.y1)
+        for bx in range(bx0, bx1 + 1):
+            for by in range(by0, by1 + 1):
+                self._buckets[(bx, by)].append(index)
+        if obj.kind in BLOCKING_KINDS:
+            xs = self.x_min + np.arange(self.cols) * self.cell_size
+            ys = self.y_min + np.arange(self.rows) * self.cell_size
+            inside_x = (xs > obj.x0) & (xs < obj.x1)
+            inside_y = (ys > obj.y0) & (ys < obj.y1)
+            self.blocked |= inside_y[:, None] & inside_x[None, :]
+        return index
+
+    # --- queries ------------------------------------------------------------
+
+    def in_bounds(self, point: Point) -> bool:
+        return self.x_min <= point[0] <= self.x_max and self.y_min <= point[1] <= self.y_max
+
+    def is_blocked(self, point: Point) -> bool:
+        """True if point is inside a wall or off the map"""
+        if not self.in_bounds(point):
+            return True
+        row, col = self.cell(point)
+        return bool(self.blocked[row, col])
+
+    def objects_at(self, point: Point, kind: Optional[str] = None) -> List[RoomObject]:
+        """Objects (of one kind, if given) whose box contains point"""
+        return [self.objects[i] for i in self._buckets.get(self._bucket(*point), ())
+                if (kind is None or self.objects[i].kind == kind) and self.objects[i].contains(point)]
+
+    def hits(self, point: Point, kind: str) -> bool:
+        return any(True for _ in self.objects_at(point, kind))
+
+    def nearest(self, point: Point, kind: str, max_distance: float = math.inf) -> Optional[RoomObject]:
+        """Closest object of a kind, searching rings of buckets outward from point"""
+        if not self._kind_counts.get(kind):
+            return None
+        bx, by = self._bucket(*point)
+        max_ring = max(self._bucket(self.x_max, self.y_max)[0], self._bucket(self.x_max, self.y_max)[1]) + 1
+        best, best_distance = None, max_distance
+        for ring in range(max_ring + 1):
+            # Anything in a farther ring is at least (ring - 1) buckets away
+            if best is not None and (ring - 1) * self.bucket_size > best_distance:
+                break
+            for key in self._ring(bx, by, ring):
+                for i in self._buckets.get(key, ()):
+                    obj = self.objects[i]
+                    if obj.kind == kind:
+                        distance = obj.distance(point)
+                        if distance <= best_distance:
+                            best, best_distance = obj, distance
+        return best
+
+    @staticmethod
+    def _ring(bx: int, by: int, ring: int) -> Iterable[Tuple[int, int]]:
+        if ring == 0:
+            yield (bx, by)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (bx + dx, by - ring)
+            yield (bx + dx, by + ring)
+        for dy in range(-ring + 1, ring):
+            yield (bx - ring, by + dy)
+            yield (bx + ring, by + dy)
+
+    def line_of_sight(self, start: Point, end: Point) -> bool:
+        """True if no blocked cell lies on the straight line from start to end.
+
+        Walks the occupancy cells the segment passes through (Amanatides &
+        Woo), so the cost depends on the distance, not on the object count.
+        """
+        (r, c), (r_end, c_end) = self.cell(start), self.cell(end)
+        # Work in cell units with cell centres on integers
+        x = (start[0] - self.x_min) / self.cell_size + 0.5
+        y = (start[1] - self.y_min) / self.cell_size + 0.5
+        dx = (end[0] - start[0]) / self.cell_size
+        dy = (end[1] - start[1]) / self.cell_size
+        step_c = 1 if dx > 0 else -1
+        step_r = 1 if dy > 0 else -1
+        t_delta_c = abs(1.0 / dx) if dx else math.inf
+        t_delta_r = abs(1.0 / dy) if dy else math.inf
+        t_max_c = ((math.floor(x) + (step_c > 0)) - x) / dx if dx else math.inf
+        t_max_r = ((math.floor(y) + (step_r > 0)) - y) / dy if dy else math.inf
+        for _ in range(abs(r_end - r) + abs(c_end - c) + 1):
+            if 0 <= r < self.rows and 0 <= c < self.cols and self.blocked[r, c]:
+                return False
+            if (r, c) == (r_end, c_end):
+                return True
+            if t_max_c < t_max_r:
+                c += step_c
+                t_max_c += t_delta_c
+            else:
+                r += step_r
+                t_max_r += t_delta_r
+        return True
+
+def room_walls(width: float, height: float, doors: Sequence[dict] = (), thickness: float = 1.5) -> List[RoomObject]:
+    """Perimeter wall boxes just outside a width x height room, with gaps for doors.
+
+    Each door is a dict with x=[x0, x1], y=[y0, y1] lying on one of the walls.
+    Walls overlap at the corners so there is no gap to slip through.
+    """
+    sides = {
+        "bottom": (0.0, lambda a, b: RoomObject("wall", "Wall", a, -thickness, b, 0.0)),
+        "top": (height, lambda a, b: RoomObject("wall", "Wall", a, height, b, height + thickness)),
+        "left": (0.0, lambda a, b: RoomObject("wall", "Wall", -thickness, a, 0.0, b)),
+        "right": (width, lambda a, b: RoomObject("wall", "Wall", width, a, width + thickness, b)),
+    }
+    walls = []
+    for side, (position, make) in sides.items():
+        horizontal = side in ("bottom", "top")
+        start, stop = (-thickness, (width if horizontal else height) + thickness)
+        gaps = sorted(
+            (min(door["x"]), max(door["x"])) if horizontal else (min(door["y"]), max(door["y"]))
+            for door in doors
+            if (door["y"][0] == door["y"][1] == position if horizontal else door["x"][0] == door["x"][1] == position)
+        )
+        for gap_start, gap_stop in gaps:
+            if gap_start > start:
+                walls.append(make(start, gap_start))
+            start = max(start, gap_stop)
+        if stop > start:
+            walls.append(make(start, stop))
+    return walls
@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class LeaderAbandoned(RuntimeError):
+    """The leader went away (its generator was closed, or it was interrupted)
+    before finishing; waiting callers should try again themselves"""
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key becomes the leader and runs the work; callers
+    arriving while it is in flight wait on the leader's future and share its
+    result (or exception). Once the call finishes the key is released, so
+    later calls run fresh. If the leader is abandoned rather than failing,
+    followers get LeaderAbandoned instead of the leader's GeneratorExit or
+    KeyboardInterrupt; do() handles it by running the call again.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def acquire(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller must lead it"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def resolve(self, key: Hashable, result: Any):
+        self._release(key).set_result(result)
+
+    def reject(self, key: Hashable, error: BaseException):
+        if not isinstance(error, Exception):
+            # Never hand a waiter the leader's GeneratorExit/KeyboardInterrupt
+            error = LeaderAbandoned(f"leader abandoned ({type(error).__name__})")
+        self._release(key).set_exception(error)
+
+    def abandon(self, key: Hashable):
+        self.reject(key, LeaderAbandoned("leader abandoned"))
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        while True:
+            future, leader = self.acquire(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except LeaderAbandoned:
+                # Take over (or follow whoever did) and try again
+                continue
+        try:
+            result = fn()
+        except BaseException as e:
+            self.reject(key, e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+            }
+
+    def _release(self, key: Hashable) -> Future:
+        with self._lock:
+            return self._calls.pop(key)
@@ -0,0 +1,50 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from counters import WriteBehindCounter
+
+def test_read_during_a_flush_counts_every_like_once():
+    durable = {"post": 0}
+    started, release = threading.Event(), threading.Event()
+
+    def slow_flush(deltas):
+        started.set()
+        release.wait(5)
+        for key, amount in deltas.items():
+            durable[key] += amount
+
+    counter = WriteBehindCounter(slow_flush, interval_seconds=3600)
+    for _ in range(3):
+        counter.increment("post")
+    flusher = threading.Thread(target=counter.flush)
+    flusher.start()
+    started.wait(5)
+
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(counter.read(lambda: durable["post"])))
+    reader.start()
+    reader.join(0.2)
+    # The read waits for the flush instead of catching it half-way
+    assert not seen
+    release.set()
+    flusher.join(5)
+    reader.join(5)
+    value, pending = seen[0]
+    assert value + pending.get("post", 0) == 3
+    counter.close()
+
+def test_failed_flush_keeps_its_deltas_pending():
+    def failing_flush(deltas):
+        raise RuntimeError("database is locked")
+
+    counter = WriteBehindCounter(failing_flush, interval_seconds=3600)
+    counter.increment("post", 2)
+    with pytest.raises(RuntimeError):
+        counter.flush()
+    assert counter.read(lambda: 0) == (0, {"post": 2})
+    counter.flush_fn = lambda deltas: None
+    counter.close()
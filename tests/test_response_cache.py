@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from response_cache import ResponseCache, content_words, normalize_prompt
+
+@pytest.mark.parametrize("cached, asked", [
+    ("What should I do during a fire?", "What should I do during a flood?"),
+    ("What should I do during an earthquake?", "What shouldn't I do during an earthquake?"),
+    ("What is sustainability?", "What is not sustainability?"),
+])
+def test_different_question_is_not_a_near_hit(cached, asked):
+    cache = ResponseCache()
+    cache.put(cached, "cached answer")
+    assert cache.get(asked) is None
+    assert cache.stats()["near_hits"] == 0
+
+def test_rephrased_question_is_a_near_hit():
+    cache = ResponseCache()
+    cache.put("What should I do during an earthquake?", "Drop, cover and hold on")
+    assert cache.get("What should we do during an earthquake??") == "Drop, cover and hold on"
+    assert cache.stats()["near_hits"] == 1
+
+def test_exact_hit_ignores_case_and_punctuation():
+    cache = ResponseCache()
+    cache.put("How do I stay safe in a storm?", "Stay indoors")
+    assert cache.get("how do i stay safe in a storm 🌩️") == "Stay indoors"
+    assert cache.stats()["hits"] == 1
+
+def test_negations_are_content_words():
+    assert "not" in content_words(normalize_prompt("What shouldn't I do?"))
+    assert "not" in content_words(normalize_prompt("Why can't I go outside?"))
+    assert content_words(normalize_prompt("What is not sustainability?")) == {"not", "sustainability"}
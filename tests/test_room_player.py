@@ -0,0 +1,20 @@
+import filecmp
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from room_player import install_plotly_js
+
+def test_plotly_js_is_copied_from_the_plotly_package(tmp_path):
+    assert install_plotly_js(str(tmp_path))
+    import plotly
+    source = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    assert filecmp.cmp(source, tmp_path / "plotly.min.js", shallow=False)
+
+def test_stale_plotly_js_is_replaced(tmp_path):
+    (tmp_path / "plotly.min.js").write_text("/* old version */")
+    assert install_plotly_js(str(tmp_path))
+    assert (tmp_path / "plotly.min.js").read_text() != "/* old version */"
+
+def test_missing_component_dir_is_reported(tmp_path):
+    assert not install_plotly_js(str(tmp_path / "missing"))
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seismic import ML_SATURATION, peak_amplitude_mm
+
+def test_amplitude_grows_tenfold_per_magnitude_below_saturation():
+    distances = np.array([15.0, 50.0, 120.0])
+    np.testing.assert_allclose(peak_amplitude_mm(5.0, distances), 10 * peak_amplitude_mm(4.0, distances))
+
+def test_amplitude_saturates_for_great_quakes():
+    distances = np.array([15.0])
+    np.testing.assert_allclose(peak_amplitude_mm(9.0, distances), peak_amplitude_mm(ML_SATURATION, distances))
+    assert peak_amplitude_mm(9.0, distances)[0] < 100.0
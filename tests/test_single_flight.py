@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from single_flight import LeaderAbandoned, SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "answer"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", work)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flights.do("k", work)))
+    follower.start()
+    while flights.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == ["answer", "answer"]
+    assert len(calls) == 1
+    assert flights.stats()["in_flight"] == 0
+
+def test_leader_error_reaches_followers():
+    flights = SingleFlight()
+    future, leader = flights.acquire("k")
+    follower_future, follower_leads = flights.acquire("k")
+    assert leader and not follower_leads
+    flights.reject("k", ValueError("api down"))
+    with pytest.raises(ValueError):
+        follower_future.result()
+
+@pytest.mark.parametrize("error", [GeneratorExit(), KeyboardInterrupt()])
+def test_abandoned_leader_never_hands_followers_its_exit(error):
+    flights = SingleFlight()
+    flights.acquire("k")
+    follower_future, _ = flights.acquire("k")
+    flights.reject("k", error)
+    with pytest.raises(LeaderAbandoned):
+        follower_future.result()
+
+def test_follower_takes_over_when_leader_is_abandoned():
+    flights = SingleFlight()
+    flights.acquire("k")
+    results = []
+    follower = threading.Thread(target=lambda: results.append(flights.do("k", lambda: "fresh")))
+    follower.start()
+    while flights.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    flights.abandon("k")
+    follower.join(5)
+    assert results == ["fresh"]
+    assert flights.stats()["leaders"] == 2
+
+def test_closing_a_streaming_leader_does_not_crash_followers(monkeypatch):
+    assistant = pytest.importorskip("assistant")
+    from llm_backends import FakeBackend
+
+    backend = FakeBackend(token_delay=0)
+    flights = SingleFlight()
+    monkeypatch.setattr(assistant, "get_llm_backend", lambda: backend)
+    monkeypatch.setattr(assistant, "get_single_flight", lambda: flights)
+    monkeypatch.setattr(assistant, "get_response_cache", lambda: assistant.ResponseCache())
+
+    stream = assistant.stream_bot_response("What should I do during a flood?")
+    next(stream)
+    results = []
+    follower = threading.Thread(
+        target=lambda: results.append(assistant.get_bot_response("What should I do during a flood?")))
+    follower.start()
+    while flights.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    stream.close()
+    follower.join(5)
+    assert results == [FakeBackend.DEFAULT_REPLY]
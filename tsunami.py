@@ -0,0 +1,416 @@
+import time
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+
+GRAVITY = 9.8
+
+# Starting wave height (m) for each kind of trigger
+BASE_HEIGHT = {
+    "Underwater Earthquake": 15,
+    "Volcanic Eruption": 20,
+    "Landslide": 10
+}
+
+MIN_WAVE_HEIGHT = 2
+
+def shallow_water_speed(depth_m: float) -> float:
+    """Long-wave speed sqrt(g * depth) in m/s"""
+    return float(np.sqrt(GRAVITY * depth_m))
+
+def warning_level(wave_height: float) -> Tuple[str, str]:
+    """(color, label) for a wave height in metres"""
+    if wave_height < 5:
+        return "yellow", "MODERATE"
+    elif wave_height < 10:
+        return "orange", "HIGH"
+    return "red", "EXTREME"
+
+def tsunami_characteristics(trigger: str, distance_km: float, depth_m: float) -> Dict:
+    """Speed, height at shore, arrival time and warning level for one scenario"""
+    speed = round(shallow_water_speed(depth_m) * 3.6, 2)  # Convert m/s to km/h
+
+    # Wave height decreases with distance
+    wave_height = round(BASE_HEIGHT[trigger] * (1 - (distance_km / 2000)), 1)
+    wave_height = max(wave_height, MIN_WAVE_HEIGHT)
+
+    arrival_time = round(distance_km / speed, 2)  # hours
+    color, level = warning_level(wave_height)
+    return {
+        "speed": speed,
+        "wave_height": wave_height,
+        "arrival_time": arrival_time,
+        "warning_color": color,
+        "warning_level": level,
+    }
+
+# --- 2-D propagation over a bathymetry grid ---------------------------------
+
+# Initial sea-surface hump (m) raised over the source for each trigger;
+# shoaling on the shelf grows it towards the BASE_HEIGHT values above
+SOURCE_AMPLITUDE = {
+    "Underwater Earthquake": 3.0,
+    "Volcanic Eruption": 4.0,
+    "Landslide": 2.0
+}
+# Sources are elongated along the coast, like a trench rupture: half-widths
+# of the Gaussian hump across and along shore
+SOURCE_RADIUS_KM = 30.0
+SOURCE_LENGTH_KM = 120.0
+# Depth (m) of the shallowest wet cell; linear long waves need h > 0
+MIN_DEPTH_M = 10.0
+SHELF_DEPTH_M = 100.0
+SHELF_WIDTH_KM = 40.0
+SLOPE_WIDTH_KM = 30.0
+ALONGSHORE_KM = 400.0
+CFL = 0.9
+SPONGE_CELLS = 8
+# A cell has "arrived" once |eta| exceeds this fraction of the source amplitude
+ARRIVAL_FRACTION = 0.02
+# Coastal heights are projected inshore with Green's law from the nearest
+# offshore cell at least this deep, where the wave is well resolved
+REFERENCE_DEPTH_M = 1000.0
+# Stop once this share of the coastline has seen the wave (sheltered corners may never)
+COAST_ARRIVED_FRACTION = 0.95
+MAX_SIM_HOURS = 6.0
+
+def synthetic_bathymetry(distance_km: float, depth_m: float, resolution_km: float = 10.0,
+                         alongshore_km: float = ALONGSHORE_KM) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """Open ocean of depth_m running east onto a shelf and a wavy coastline.
+
+    The source sits distance_km offshore of the coast. Returns
+    (depth, dx_m, source) where depth is (rows, cols) in metres with 0 for
+    land and source is the (row, col) of the source centre.
+    """
+    dx_km = float(resolution_km)
+    margin_km = 2 * SOURCE_RADIUS_KM
+    land_km = 4 * dx_km + 30.0
+    width_km = max(distance_km, 2 * dx_km) + margin_km + land_km
+    cols = int(np.ceil(width_km / dx_km))
+    rows = int(np.ceil(alongshore_km / dx_km))
+    x = (np.arange(cols) + 0.5) * dx_km
+    y = (np.arange(rows) + 0.5) * dx_km
+
+    # Bays and headlands: the coast wanders +-20 km around its mean position
+    mean_coast = width_km - land_km
+    coast = mean_coast + 20.0 * np.sin(2 * np.pi * y / alongshore_km * 1.5)
+    offshore = coast[:, None] - x[None, :]  # km seaward of the coast, < 0 on land
+
+    shelf = MIN_DEPTH_M + (SHELF_DEPTH_M - MIN_DEPTH_M) * np.clip(offshore / SHELF_WIDTH_KM, 0.0, 1.0)
+    ramp = np.clip((offshore - SHELF_WIDTH_KM) / SLOPE_WIDTH_KM, 0.0, 1.0)
+    slope = ramp * ramp * (3 - 2 * ramp)  # smoothstep down the continental slope
+    deep = max(depth_m, SHELF_DEPTH_M)
+    depth = np.where(offshore > 0, shelf + (deep - SHELF_DEPTH_M) * slope, 0.0)
+
+    # Measured from the coast at the source's own row so it is always at sea
+    source_row = rows // 2
+    source_x = coast[source_row] - max(distance_km, 2 * dx_km)
+    source = (source_row, int(np.clip(source_x / dx_km, 0, cols - 1)))
+    return depth, dx_km * 1000.0, source
+
+def load_bathymetry(source, stride: int = 1) -> np.ndarray:
+    """Depth grid (m, positive below sea level) from a .npy or text/CSV file.
+
+    source may be a path or a binary file object. Values <= 0 are land.
+    stride keeps every stride-th cell to coarsen a fine grid.
+    """
+    name = getattr(source, "name", str(source))
+    if name.endswith(".npy"):
+        depth = np.load(source)
+    else:
+        depth = np.loadtxt(source, delimiter="," if name.endswith(".csv") else None)
+    depth = np.asarray(depth, dtype=float)
+    if depth.ndim != 2:
+        raise ValueError(f"Bathymetry must be a 2-D grid, got shape {depth.shape}")
+    return np.where(depth > 0, depth, 0.0)[::stride, ::stride]
+
+def coastline_cells(depth: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(rows, cols) of wet cells that touch land on one of their four sides"""
+    land = depth <= 0
+    touches = np.zeros_like(land)
+    touches[1:, :] |= land[:-1, :]
+    touches[:-1, :] |= land[1:, :]
+    touches[:, 1:] |= land[:, :-1]
+    touches[:, :-1] |= land[:, 1:]
+    return np.nonzero(~land & touches)
+
+def nearest_reference_cells(depth: np.ndarray, reference_depth_m: float = REFERENCE_DEPTH_M) -> np.ndarray:
+    """Flat index of a nearby cell at least reference_depth_m deep for every cell.
+
+    Labels spread outward from the deep cells one wet cell per pass, so each
+    shallow cell gets the deep cell with the fewest wet steps to it. Cells
+    the deep water can't reach keep -1.
+    """
+    wet = depth > 0
+    deep = depth >= reference_depth_m
+    labels = np.where(deep, np.arange(depth.size).reshape(depth.shape), -1)
+    while True:
+        grown = labels.copy()
+        for shifted, target in (
+            (labels[:-1, :], grown[1:, :]), (labels[1:, :], grown[:-1, :]),
+            (labels[:, :-1], grown[:, 1:]), (labels[:, 1:], grown[:, :-1]),
+        ):
+            fill = (target < 0) & (shifted >= 0)
+            target[fill] = shifted[fill]
+        grown[~wet] = -1
+        if np.array_equal(grown, labels):
+            return labels
+        labels = grown
+
+def _sponge(shape: Tuple[int, int], wet: np.ndarray, cells: int) -> np.ndarray:
+    """Damping factor < 1 near open-ocean grid edges so waves leave the domain"""
+    rows, cols = shape
+    edge = np.minimum.reduce([
+        np.arange(rows)[:, None] + np.zeros(cols),
+        (rows - 1 - np.arange(rows))[:, None] + np.zeros(cols),
+        np.arange(cols)[None, :] + np.zeros((rows, 1)),
+        (cols - 1 - np.arange(cols))[None, :] + np.zeros((rows, 1)),
+    ])
+    damping = 1.0 - 0.1 * np.clip(1.0 - edge / cells, 0.0, 1.0) ** 2
+    return np.where(wet, damping, 1.0)
+
+class ShallowWaterSolver:
+    """Linear shallow-water propagation of a Gaussian hump over a depth grid.
+
+    Surface height eta lives at cell centres and the velocities u, v on the
+    cell faces (Arakawa C-grid), stepped forward-backward with a CFL-limited
+    dt. Faces next to land carry no flux, so coasts reflect; a sponge layer
+    absorbs waves at the open grid edges. The source hump is never narrower
+    than a few cells so coarse grids still resolve it. Nothing is computed
+    until step() or frames() is called.
+    """
+
+    def __init__(self, depth: np.ndarray, dx_m: float, source: Tuple[int, int],
+                 amplitude: float = 1.0, source_radius_km: float = SOURCE_RADIUS_KM,
+                 source_length_km: float = SOURCE_LENGTH_KM):
+        self.depth = np.asarray(depth, dtype=float)
+        self.dx_m = dx_m
+        self.source = source
+        self.amplitude = amplitude
+        self.wet = self.depth > 0
+        # float32 halves the memory traffic of every step; plenty for metre-scale waves
+        self.h = np.where(self.wet, np.maximum(self.depth, MIN_DEPTH_M), 0.0).astype(np.float32)
+        rows, cols = self.h.shape
+        dx_km = dx_m / 1000.0
+
+        # Flux depth on each face; zero if either side is land or it is a grid edge
+        self.hu = np.zeros((rows, cols + 1), dtype=np.float32)
+        self.hu[:, 1:-1] = np.minimum(self.h[:, :-1], self.h[:, 1:])
+        self.hv = np.zeros((rows + 1, cols), dtype=np.float32)
+        self.hv[1:-1, :] = np.minimum(self.h[:-1, :], self.h[1:, :])
+
+        c_max = np.sqrt(GRAVITY * float(self.h.max()))
+        self.dt = CFL * dx_m / (c_max * np.sqrt(2.0))
+        self._g_dt_dx = np.float32(GRAVITY * self.dt / dx_m)
+        self._dt_dx = np.float32(self.dt / dx_m)
+
+        r0, c0 = source
+        self.sigma_x = max(source_radius_km / 2, 1.5 * dx_km)
+        sigma_y = max(source_length_km / 2, 1.5 * dx_km)
+        dy2 = ((np.arange(rows) - r0) * dx_km / sigma_y) ** 2
+        dx2 = ((np.arange(cols) - c0) * dx_km / self.sigma_x) ** 2
+        hump = amplitude * np.exp(-0.5 * (dy2[:, None] + dx2[None, :]))
+        self.eta = np.where(self.wet, hump, 0.0).astype(np.float32)
+        self._u = np.zeros_like(self.hu)
+        self._v = np.zeros_like(self.hv)
+        self._flux_u = np.zeros_like(self.hu)
+        self._flux_v = np.zeros_like(self.hv)
+        self.damping = _sponge(self.h.shape, self.wet, SPONGE_CELLS).astype(np.float32)
+        self.steps = 0
+        self.sim_time = 0.0
+
+    def step(self) -> np.ndarray:
+        """Advance one dt; returns eta, which is updated in place"""
+        eta, u, v = self.eta, self._u, self._v
+        # Momentum: du/dt = -g d(eta)/dx, then continuity with the new velocities
+        u[:, 1:-1] -= self._g_dt_dx * (eta[:, 1:] - eta[:, :-1])
+        v[1:-1, :] -= self._g_dt_dx * (eta[1:, :] - eta[:-1, :])
+        np.multiply(self.hu, u, out=self._flux_u)
+        np.multiply(self.hv, v, out=self._flux_v)
+        flux_u, flux_v = self._flux_u, self._flux_v
+        eta -= self._dt_dx * (flux_u[:, 1:] - flux_u[:, :-1] + flux_v[1:, :] - flux_v[:-1, :])
+        eta *= self.damping
+        self.steps += 1
+        self.sim_time += self.dt
+        return eta
+
+    def frames(self, every_seconds: float, max_sim_seconds: float = MAX_SIM_HOURS * 3600,
+               max_cells: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """Lazily yield (sim_time, eta) every every_seconds of simulated time.
+
+        Steps are only computed when the next frame is asked for, so the
+        first frame is ready straight away and a consumer that stops early
+        never pays for the rest of the run. Each frame is a fresh copy,
+        strided so it has at most max_cells cells if given.
+        """
+        stride = 1
+        if max_cells:
+            stride = max(int(np.ceil(np.sqrt(self.eta.size / max_cells))), 1)
+        yield self.sim_time, self.eta[::stride, ::stride].copy()
+        next_frame = self.sim_time + every_seconds
+        while self.sim_time < max_sim_seconds:
+            self.step()
+            if self.sim_time >= next_frame:
+                next_frame += every_seconds
+                yield self.sim_time, self.eta[::stride, ::stride].copy()
+
+class PropagationRun:
+    """One ShallowWaterSolver run that tracks arrival and peak height as it goes.
+
+    The run stops once nearly all of the coastline has seen the wave and the
+    crest has had time to pass, at max_sim_seconds, or when time_budget_s of
+    computing time is used up. Drive it with run(), or with frames() to
+    watch the wave on the way; either way result() then has the maps.
+
+    Shelf waves are much shorter than deep-ocean ones and need a fine grid,
+    so "coast_max" takes the peak at the nearest cell REFERENCE_DEPTH_M deep
+    and carries it inshore with Green's law, A_coast = A_ref (h_ref /
+    h_coast) ** 0.25; "coast_max_grid" is the raw value in the coastal cell.
+    """
+
+    def __init__(self, depth: np.ndarray, dx_m: float, source: Tuple[int, int],
+                 amplitude: float = 1.0, source_radius_km: float = SOURCE_RADIUS_KM,
+                 source_length_km: float = SOURCE_LENGTH_KM,
+                 max_sim_seconds: float = MAX_SIM_HOURS * 3600,
+                 time_budget_s: Optional[float] = 5.0):
+        started = time.perf_counter()
+        self.solver = solver = ShallowWaterSolver(depth, dx_m, source, amplitude, source_radius_km,
+                                                  source_length_km)
+        self.max_sim_seconds = max_sim_seconds
+        self.time_budget_s = time_budget_s
+        r0, c0 = source
+
+        self.threshold = ARRIVAL_FRACTION * amplitude
+        self.arrival = np.full(solver.h.shape, np.nan)
+        self.max_amplitude = np.abs(solver.eta)
+        self.pending = self.max_amplitude <= self.threshold
+        self.arrival[~self.pending] = 0.0
+        self.coast = coastline_cells(solver.depth)
+        # Coast inside the sponge is damped and may never see the wave; don't wait for it
+        inner = (solver.damping[self.coast] == 1.0)
+        self.watched = (self.coast[0][inner], self.coast[1][inner])
+        if not self.watched[0].size:
+            self.watched = self.coast
+        self.coast_needed = int(np.ceil(COAST_ARRIVED_FRACTION * self.watched[0].size))
+        # A few wave periods at the source: time for the crest to follow the front
+        self.tail = 3 * 4 * solver.sigma_x * 1000.0 / np.sqrt(GRAVITY * float(solver.h[r0, c0])) \
+            if solver.wet[r0, c0] else 0.0
+
+        # Rough length of the run, for spacing animation frames: the farthest
+        # watched coast at the mean wet-cell wave speed, plus the tail
+        if self.watched[0].size and solver.wet.any():
+            reach_m = float(np.hypot(self.watched[0] - r0, self.watched[1] - c0).max()) * dx_m
+            speed = np.sqrt(GRAVITY * float(solver.h[solver.wet].mean()))
+            self.expected_seconds = min(reach_m / speed + self.tail, max_sim_seconds)
+        else:
+            self.expected_seconds = max_sim_seconds
+
+        self.all_arrived_at = None
+        self.completed = True
+        self.done = False
+        self._abs_eta = np.empty_like(solver.eta)
+        self._newly = np.empty_like(self.pending)
+        self.compute_seconds = time.perf_counter() - started
+
+    def _advance(self) -> None:
+        """One solver step plus the arrival and peak bookkeeping"""
+        solver = self.solver
+        if solver.sim_time >= self.max_sim_seconds:
+            self.done = True
+            return
+        if self.time_budget_s is not None and self.compute_seconds > self.time_budget_s:
+            self.completed = False
+            self.done = True
+            return
+        solver.step()
+        sim_time = solver.sim_time
+        abs_eta, newly, pending = self._abs_eta, self._newly, self.pending
+
+        np.abs(solver.eta, out=abs_eta)
+        np.maximum(self.max_amplitude, abs_eta, out=self.max_amplitude)
+        np.greater(abs_eta, self.threshold, out=newly)
+        newly &= pending
+        if newly.any():
+            self.arrival[newly] = sim_time
+            pending &= ~newly
+            if self.all_arrived_at is None and self.coast_needed and \
+                    np.count_nonzero(~pending[self.watched]) >= self.coast_needed:
+                self.all_arrived_at = sim_time
+        if self.all_arrived_at is not None and sim_time - self.all_arrived_at >= self.tail:
+            self.done = True
+
+    def _advance_until(self, sim_time: float) -> None:
+        """Step until sim_time or the end of the run, timing the work"""
+        spent, started = self.compute_seconds, time.perf_counter()
+        while not self.done and self.solver.sim_time < sim_time:
+            self._advance()
+            self.compute_seconds = spent + time.perf_counter() - started
+
+    def frames(self, every_seconds: float, max_cells: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """Lazily yield (sim_time, eta) every every_seconds of simulated time
+        until the run stops, then once more for its final state.
+
+        Like ShallowWaterSolver.frames, steps are only computed when the next
+        frame is asked for; time spent between frames showing them doesn't
+        count against the time budget.
+        """
+        eta = self.solver.eta
+        stride = 1
+        if max_cells:
+            stride = max(int(np.ceil(np.sqrt(eta.size / max_cells))), 1)
+        yield self.solver.sim_time, eta[::stride, ::stride].copy()
+        next_frame = self.solver.sim_time + every_seconds
+        shown = self.solver.steps
+        while not self.done:
+            self._advance_until(next_frame)
+            # A coarse grid's dt can be longer than every_seconds
+            while next_frame <= self.solver.sim_time:
+                next_frame += every_seconds
+            if self.solver.steps > shown:
+                shown = self.solver.steps
+                yield self.solver.sim_time, eta[::stride, ::stride].copy()
+
+    def run(self) -> Dict:
+        """Step to the end without frames and return result()"""
+        self._advance_until(np.inf)
+        return self.result()
+
+    def result(self) -> Dict:
+        """Per-cell "arrival" (s, NaN where the wave never got) and
+        "max_amplitude" (m) maps, the "coast" (rows, cols) with
+        "coast_arrival", "coast_max" and "coast_max_grid" along it, and run
+        statistics so far"""
+        solver = self.solver
+        depth, h, coast = solver.depth, solver.h, self.coast
+        max_amplitude = self.max_amplitude.astype(float)
+        max_amplitude[~solver.wet] = 0.0
+        coast_max_grid = max_amplitude[coast]
+        reference = nearest_reference_cells(depth)[coast]
+        coast_max = coast_max_grid.copy()
+        has_reference = reference >= 0
+        ref_depth = h.ravel()[reference[has_reference]].astype(float)
+        shoaling = (ref_depth / h[coast][has_reference].astype(float)) ** 0.25
+        coast_max[has_reference] = max_amplitude.ravel()[reference[has_reference]] * shoaling
+        arrival = self.arrival.copy()
+        return {
+            "arrival": arrival,
+            "max_amplitude": max_amplitude,
+            "coast": coast,
+            "coast_arrival": arrival[coast],
+            "coast_max": coast_max,
+            "coast_max_grid": coast_max_grid,
+            "dx_m": solver.dx_m,
+            "dt": solver.dt,
+            "steps": solver.steps,
+            "sim_seconds": solver.sim_time,
+            "wall_seconds": self.compute_seconds,
+            "completed": self.completed,
+        }
+
+def simulate_propagation(depth: np.ndarray, dx_m: float, source: Tuple[int, int],
+                         amplitude: float = 1.0, source_radius_km: float = SOURCE_RADIUS_KM,
+                         source_length_km: float = SOURCE_LENGTH_KM,
+                         max_sim_seconds: float = MAX_SIM_HOURS * 3600,
+                         time_budget_s: Optional[float] = 5.0) -> Dict:
+    """Run a PropagationRun to the end and return its result()"""
+    return PropagationRun(depth, dx_m, source, amplitude, source_radius_km, source_length_km,
+                          max_sim_seconds, time_budget_s).run()